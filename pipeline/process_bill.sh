@@ -195,7 +195,7 @@ echo
 
 # Step 10: Transform and copy to web app
 echo -e "${YELLOW}Step 10/10: Copying to web app...${NC}"
-python scripts/10_transform_for_web.py "$JSON_OUTPUT"
+python scripts/10_transform_for_web.py "$JSON_OUTPUT" $FORCE_FLAG
 
 if [ $? -ne 0 ]; then
     echo -e "${RED}Error in web app transformation${NC}"
@@ -8,13 +8,28 @@ This script:
 3. Saves it to src/data/bills for the Astro web app
 """
 
-import json
+import hashlib
+import os
 import sys
 from pathlib import Path
-import re
 import shutil
 import subprocess
-from shared import TOPICS, slugify
+import orjson
+from shared import TOPICS, load_json, save_json, slugify
+
+# Shared read-only default for missing nested objects (avoids allocating a {} per lookup)
+_EMPTY = {}
+
+# Map topic names to impact keys (must match frontend IMPACT_CATEGORIES)
+TOPIC_TO_KEY = {
+    'Digital Innovation': 'innovation',
+    'Freedom of Speech': 'freedomOfSpeech',
+    'Privacy & Data Rights': 'privacy',
+    'Business Environment': 'business'
+}
+
+# Impact key for every known topic, resolved once at import
+TOPIC_KEYS = {topic: TOPIC_TO_KEY.get(topic, slugify(topic)) for topic in TOPICS}
 
 
 def transform_bill(bill_data: dict, filename: str) -> dict:
@@ -37,19 +52,11 @@ def transform_bill(bill_data: dict, filename: str) -> dict:
     impacts = {}
     impact_analyses = bill_data.get('impactAnalyses', {})
 
-    # Map topic names to impact keys (must match frontend IMPACT_CATEGORIES)
-    topic_to_key = {
-        'Digital Innovation': 'innovation',
-        'Freedom of Speech': 'freedomOfSpeech',
-        'Privacy & Data Rights': 'privacy',
-        'Business Environment': 'business'
-    }
-
     # Initialize impacts dict for categories with analyses
     for topic in TOPICS:
         if topic in impact_analyses:
             analysis_data = impact_analyses[topic]
-            impact_key = topic_to_key.get(topic, slugify(topic))
+            impact_key = TOPIC_KEYS[topic]
 
             # The analysis field contains both score and analysis text
             analysis_content = analysis_data.get('analysis', {})
@@ -65,32 +72,31 @@ def transform_bill(bill_data: dict, filename: str) -> dict:
     sections = bill_data.get('sections', [])
 
     for section in sections:
-        if section.get('category', {}).get('type') != 'provision':
+        if (section.get('category') or _EMPTY).get('type') != 'provision':
             continue
 
         provision_id = section.get('id', '')
 
         # Determine which impacts this provision affects
         related_impacts = []
-        impact_data = section.get('impact', {})
-        if impact_data:
-            impact_levels = impact_data.get('levels', {})
-            for topic, level in impact_levels.items():
-                # Include if not neutral or none
-                if level and level != 'neutral' and level != 'none':
-                    impact_key = topic_to_key.get(topic, slugify(topic))
-                    related_impacts.append(impact_key)
-
-                    # Ensure this impact category exists in impacts dict
-                    if impact_key not in impacts:
-                        impacts[impact_key] = {
-                            'score': 'neutral',
-                            'description': None,
-                            'relatedProvisions': []
-                        }
-
-                    # Add this provision to the impact's related provisions list
-                    impacts[impact_key]['relatedProvisions'].append(provision_id)
+        impact_levels = (section.get('impact') or _EMPTY).get('levels') or _EMPTY
+        for topic, level in impact_levels.items():
+            # Include if not neutral or none
+            if level and level not in ('neutral', 'none'):
+                impact_key = TOPIC_KEYS.get(topic) or slugify(topic)
+                related_impacts.append(impact_key)
+
+                # Ensure this impact category exists in impacts dict
+                impact = impacts.get(impact_key)
+                if impact is None:
+                    impact = impacts[impact_key] = {
+                        'score': 'neutral',
+                        'description': None,
+                        'relatedProvisions': []
+                    }
+
+                # Add this provision to the impact's related provisions list
+                impact['relatedProvisions'].append(provision_id)
 
         provisions.append({
             'id': provision_id,
@@ -538,8 +544,7 @@ def generate_og_image(web_bill: dict, bill_id: str, project_root: Path):
         svg_content = generate_og_image_svg(web_bill)
         svg_path = og_dir / f"{bill_id}.svg"
 
-        with open(svg_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
+        svg_path.write_text(svg_content, encoding='utf-8')
 
         print(f"✓ Generated OG SVG: {svg_path.relative_to(project_root)}")
 
@@ -584,8 +589,7 @@ def generate_concern_og_images(web_bill: dict, bill_id: str, project_root: Path)
             filename_base = f"{bill_id}_{concern_id}"
             svg_path = og_concerns_dir / f"{filename_base}.svg"
 
-            with open(svg_path, 'w', encoding='utf-8') as f:
-                f.write(svg_content)
+            svg_path.write_text(svg_content, encoding='utf-8')
 
             print(f"  ✓ Generated concern OG SVG: {svg_path.relative_to(project_root)}")
 
@@ -599,32 +603,127 @@ def generate_concern_og_images(web_bill: dict, bill_id: str, project_root: Path)
         print(f"  ⚠ Warning: Could not generate concern OG images: {e}")
 
 
-def process_bill(json_path: Path, web_app_dir: Path, dry_run: bool = False):
+def copy_pdf(source_pdf: Path, dest_pdf: Path) -> str:
+    """Copy a PDF into the web app as cheaply as the filesystem allows.
+
+    Tries a hardlink first (no data copied), then `cp --reflink=auto` on Linux
+    (copy-on-write clone where supported), then a plain data copy.
+
+    Args:
+        source_pdf: PDF in pipeline/pdfs
+        dest_pdf: Destination in public/pdfs
+
+    Returns:
+        How the file was copied: 'hardlink', 'cp' or 'copy'
+    """
+    if dest_pdf.exists():
+        if dest_pdf.samefile(source_pdf):
+            return 'hardlink'
+        dest_pdf.unlink()
+
+    try:
+        os.link(source_pdf, dest_pdf)
+        return 'hardlink'
+    except OSError:
+        pass
+
+    if sys.platform.startswith('linux'):
+        cmd = ['cp', '--reflink=auto', '--preserve=timestamps', str(source_pdf), str(dest_pdf)]
+        if subprocess.run(cmd, capture_output=True).returncode == 0:
+            return 'cp'
+
+    shutil.copyfile(source_pdf, dest_pdf)
+    return 'copy'
+
+
+def source_digest(bill_data: dict) -> str:
+    """Hash the pipeline bill data together with the transform code.
+
+    metadata.processedAt is left out: step 9 restamps it on every run, so it would
+    otherwise make every bill look changed. Including this script and shared.py
+    means changes to the transform also invalidate outputs.
+
+    Args:
+        bill_data: Pipeline bill data
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    metadata = {k: v for k, v in bill_data.get('metadata', {}).items() if k != 'processedAt'}
+    digest = hashlib.sha256(orjson.dumps({**bill_data, 'metadata': metadata}, option=orjson.OPT_SORT_KEYS))
+    digest.update(Path(__file__).read_bytes())
+    digest.update(Path(__file__).with_name('shared.py').read_bytes())
+    return digest.hexdigest()
+
+
+def is_up_to_date(json_path: Path, bill_data: dict, output_path: Path, source_pdf: Path = None,
+                  dest_pdf: Path = None) -> bool:
+    """Check whether the web app copy of a bill is already current.
+
+    Compares modification times first. If the sources look newer (step 9 rewrites
+    the bill JSON on every pipeline run), compares the bill's content digest with
+    the one recorded locally by the last successful run.
+
+    Args:
+        json_path: Path to pipeline bill JSON
+        bill_data: Pipeline bill data loaded from json_path
+        output_path: Path to web app bill JSON
+        source_pdf: PDF in pipeline/pdfs, if the bill has one
+        dest_pdf: PDF destination in public/pdfs
+
+    Returns:
+        True if the bill can be skipped
+    """
+    if not output_path.exists():
+        return False
+
+    if source_pdf and source_pdf.exists():
+        if not dest_pdf.exists() or dest_pdf.stat().st_mtime < source_pdf.stat().st_mtime:
+            return False
+
+    output_mtime = output_path.stat().st_mtime
+    sources = (json_path, Path(__file__), Path(__file__).with_name('shared.py'))
+    if all(output_mtime >= source.stat().st_mtime for source in sources):
+        return True
+
+    digest_path = json_path.with_suffix('.sha256')
+    return digest_path.exists() and digest_path.read_text().strip() == source_digest(bill_data)
+
+
+def process_bill(json_path: Path, web_app_dir: Path, dry_run: bool = False, force: bool = False):
     """Transform and copy a bill to the web app.
 
     Args:
         json_path: Path to pipeline bill JSON
         web_app_dir: Path to web app's src/data/bills directory
         dry_run: If True, only show output without saving
-
-    Note: Always overwrites existing files to ensure latest data is used.
+        force: If True, regenerate even if the web app copy is up to date
     """
     print(f"\nProcessing: {json_path.name}")
     print("=" * 80)
 
     # Load pipeline JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     # Get bill ID from metadata (which has the clean slug)
     metadata = bill_data.get('metadata', {})
     bill_id = metadata.get('slug', '')
     filename = json_path.stem
 
-    # Output path
+    # Output paths
     output_path = web_app_dir / f"{bill_id}.json"
+    project_root = web_app_dir.parent.parent.parent
+    pdf_filename = json_path.stem + '.pdf'
+    source_pdf = json_path.parent.parent / 'pdfs' / pdf_filename
+    dest_pdf = project_root / 'public' / 'pdfs' / pdf_filename
+
+    # Skip bills whose web app data is already current
+    has_pdf = bool(metadata.get('pdfPath'))
+    if not force and is_up_to_date(json_path, bill_data, output_path, source_pdf if has_pdf else None, dest_pdf):
+        print(f"✓ Up to date: {output_path.relative_to(project_root)}")
+        print("  Skipping (use --force to regenerate)")
+        return
 
-    # Always overwrite (no check needed - we always want latest data)
     if output_path.exists():
         print(f"Overwriting existing file at: {output_path.relative_to(web_app_dir.parent.parent.parent)}")
     else:
@@ -655,27 +754,18 @@ def process_bill(json_path: Path, web_app_dir: Path, dry_run: bool = False):
     web_app_dir.mkdir(parents=True, exist_ok=True)
 
     # Save
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(web_bill, f, indent=2, ensure_ascii=False)
+    save_json(output_path, web_bill)
 
     print(f"✓ Saved to: {output_path.relative_to(web_app_dir.parent.parent.parent)}")
 
-    # Get project root
-    project_root = web_app_dir.parent.parent.parent
-
     # Copy PDF to public directory if available
     if web_bill.get('pdfPath'):
-        pdf_filename = json_path.stem + '.pdf'
-        source_pdf = json_path.parent.parent / 'pdfs' / pdf_filename
-
         if source_pdf.exists():
             # Create public/pdfs directory if it doesn't exist
-            public_pdfs_dir = project_root / 'public' / 'pdfs'
-            public_pdfs_dir.mkdir(parents=True, exist_ok=True)
+            dest_pdf.parent.mkdir(parents=True, exist_ok=True)
 
-            dest_pdf = public_pdfs_dir / pdf_filename
-            shutil.copy2(source_pdf, dest_pdf)
-            print(f"✓ Copied PDF to: {dest_pdf.relative_to(project_root)}")
+            method = copy_pdf(source_pdf, dest_pdf)
+            print(f"✓ Copied PDF to: {dest_pdf.relative_to(project_root)} ({method})")
         else:
             print(f"⚠ Warning: PDF not found at {source_pdf}")
 
@@ -685,21 +775,24 @@ def process_bill(json_path: Path, web_app_dir: Path, dry_run: bool = False):
     # Generate concern OG images
     generate_concern_og_images(web_bill, bill_id, project_root)
 
+    # Record what this output was built from so unchanged reruns can be skipped
+    json_path.with_suffix('.sha256').write_text(source_digest(bill_data) + '\n')
+
 
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python 10_transform_for_web.py <bill-json-path> [--dry-run]")
+        print("Usage: python 10_transform_for_web.py <bill-json-path> [--dry-run] [--force]")
         print()
         print("Example:")
         print("  python 10_transform_for_web.py 'output/1. National Information Technology Authority (Amendment) Bill.json'")
         print("  python 10_transform_for_web.py output/bill.json --dry-run  # Test without saving")
-        print()
-        print("Note: Always overwrites existing files to ensure latest data is used.")
+        print("  python 10_transform_for_web.py output/bill.json --force    # Regenerate even if up to date")
         sys.exit(1)
 
     # Check for flags
     dry_run = "--dry-run" in sys.argv
+    force = "--force" in sys.argv or "-f" in sys.argv
 
     # Get bill path
     bill_path = Path(sys.argv[1])
@@ -720,7 +813,7 @@ def main():
 
     # Process
     try:
-        process_bill(bill_path, web_app_dir, dry_run=dry_run)
+        process_bill(bill_path, web_app_dir, dry_run=dry_run, force=force)
     except Exception as e:
         print(f"Error processing {bill_path.name}: {e}")
         import traceback
@@ -6,16 +6,44 @@ Exports both markdown (for human review) and structured JSON (for parsing).
 
 Usage:
     python 1_pdf_to_text.py <path-to-pdf>
+    python 1_pdf_to_text.py --batch <pdf-directory> [--workers N]
 
 Example:
     python 1_pdf_to_text.py pdfs/cybersecurity-bill-2025.pdf
+    python 1_pdf_to_text.py --batch pdfs/
 """
 
 import sys
 import os
-import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from docling.document_converter import DocumentConverter
+from shared import save_json
+
+# Per-process DocumentConverter so Docling's models load once per process, not per PDF
+_CONVERTER = None
+
+
+def _get_converter():
+    """Return this process's DocumentConverter, creating it on first use.
+
+    Docling is imported here rather than at module level: the import takes seconds,
+    and usage errors and already-converted PDFs never need it.
+    """
+    global _CONVERTER
+    if _CONVERTER is None:
+        from docling.document_converter import DocumentConverter
+        _CONVERTER = DocumentConverter()
+    return _CONVERTER
+
+
+def get_output_paths(pdf_path: str, output_dir: str = "output") -> tuple:
+    """Return the (markdown, docling JSON) output paths for a PDF."""
+    pdf_filename = Path(pdf_path).stem
+    markdown_output = Path(output_dir) / f"{pdf_filename}.md"
+    json_output = Path(output_dir) / f"{pdf_filename}.docling.json"
+    return markdown_output, json_output
+
 
 def convert_pdf_to_text(pdf_path: str, output_dir: str = "output", force: bool = False):
     """
@@ -29,10 +57,7 @@ def convert_pdf_to_text(pdf_path: str, output_dir: str = "output", force: bool =
     # Ensure output directory exists
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # Get the PDF filename without extension
-    pdf_filename = Path(pdf_path).stem
-    markdown_output = Path(output_dir) / f"{pdf_filename}.md"
-    json_output = Path(output_dir) / f"{pdf_filename}.docling.json"
+    markdown_output, json_output = get_output_paths(pdf_path, output_dir)
 
     # Check if outputs already exist
     if markdown_output.exists() and json_output.exists() and not force:
@@ -49,21 +74,25 @@ def convert_pdf_to_text(pdf_path: str, output_dir: str = "output", force: bool =
     print(f"  - Markdown: {markdown_output}")
     print(f"  - JSON: {json_output}")
 
-    # Initialize the DocumentConverter
-    converter = DocumentConverter()
+    # Reuse the DocumentConverter for this process
+    converter = _get_converter()
 
     # Convert the PDF
     result = converter.convert(pdf_path)
 
     # Export to markdown (for human review)
     markdown_content = result.document.export_to_markdown()
-    with open(markdown_output, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
+    markdown_output.write_text(markdown_content, encoding='utf-8')
 
     # Export to structured JSON (for parsing)
-    doc_dict = result.document.export_to_dict()
-    with open(json_output, 'w', encoding='utf-8') as f:
-        json.dump(doc_dict, f, indent=2, ensure_ascii=False)
+    # Serialize straight from the pydantic model to avoid building an intermediate dict;
+    # by_alias/exclude_none match what export_to_dict() produces
+    document = result.document
+    if hasattr(document, 'model_dump_json'):
+        json_content = document.model_dump_json(indent=2, by_alias=True, exclude_none=True)
+        json_output.write_text(json_content, encoding='utf-8')
+    else:
+        save_json(json_output, document.export_to_dict())
 
     print(f"\n✓ Conversion complete!")
     print(f"✓ Markdown saved to: {markdown_output}")
@@ -73,17 +102,95 @@ def convert_pdf_to_text(pdf_path: str, output_dir: str = "output", force: bool =
 
     return markdown_output, json_output
 
+def convert_many(pdf_paths: list, output_dir: str = "output", force: bool = False, workers: int = None):
+    """
+    Convert several PDFs in parallel, loading Docling's models once per worker.
+
+    Args:
+        pdf_paths: Paths to the PDF files
+        output_dir: Directory to save the output files
+        force: If True, reconvert even if outputs already exist
+        workers: Number of worker processes (defaults to half the CPU count)
+
+    Returns:
+        List of PDF paths that failed to convert
+    """
+    # Decide what to skip up front so no worker is started just to skip a PDF
+    pending = []
+    for pdf_path in pdf_paths:
+        markdown_output, json_output = get_output_paths(pdf_path, output_dir)
+        if markdown_output.exists() and json_output.exists() and not force:
+            print(f"✓ Skipping (outputs exist): {Path(pdf_path).name}")
+        else:
+            pending.append(pdf_path)
+
+    if not pending:
+        print("\nAll PDFs already converted (use --force to reconvert)")
+        return []
+
+    workers = min(workers or max(1, (os.cpu_count() or 2) // 2), len(pending))
+    print(f"\nConverting {len(pending)} PDF(s) with {workers} worker(s)...\n")
+
+    # Spawn fresh interpreters so each worker gets clean (CUDA) state for Docling's models
+    context = multiprocessing.get_context('spawn')
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_get_converter) as executor:
+        futures = {
+            executor.submit(convert_pdf_to_text, str(pdf_path), output_dir, force): pdf_path
+            for pdf_path in pending
+        }
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error converting {Path(pdf_path).name}: {e}")
+                failed.append(pdf_path)
+
+    print()
+    print(f"✓ Converted {len(pending) - len(failed)}/{len(pending)} PDF(s)")
+    for pdf_path in failed:
+        print(f"  ✗ {Path(pdf_path).name}")
+
+    return failed
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python 1_pdf_to_text.py <path-to-pdf> [--force]")
+        print("       python 1_pdf_to_text.py --batch <pdf-directory> [--workers N] [--force]")
         print("\nExample:")
         print("  python 1_pdf_to_text.py pdfs/cybersecurity-bill-2025.pdf")
         print("  python 1_pdf_to_text.py pdfs/bill.pdf --force  # Force reconversion")
+        print("  python 1_pdf_to_text.py --batch pdfs/          # Convert every PDF in pdfs/")
         sys.exit(1)
 
-    pdf_path = sys.argv[1]
     force = '--force' in sys.argv or '-f' in sys.argv
 
+    if sys.argv[1] == '--batch':
+        if len(sys.argv) < 3 or not os.path.isdir(sys.argv[2]):
+            print("Error: --batch requires a directory of PDFs")
+            sys.exit(1)
+
+        workers = None
+        if '--workers' in sys.argv:
+            value = sys.argv[sys.argv.index('--workers') + 1:][:1]
+            if not value or not value[0].isdigit() or int(value[0]) < 1:
+                print("Error: --workers requires a positive number")
+                print("Usage: python 1_pdf_to_text.py --batch <pdf-directory> [--workers N] [--force]")
+                sys.exit(1)
+            workers = int(value[0])
+
+        pdf_paths = sorted(Path(sys.argv[2]).glob('*.pdf'))
+        if not pdf_paths:
+            print(f"Error: No PDF files found in {sys.argv[2]}")
+            sys.exit(1)
+
+        failed = convert_many(pdf_paths, force=force, workers=workers)
+        sys.exit(1 if failed else 0)
+
+    pdf_path = sys.argv[1]
+
     if not os.path.exists(pdf_path):
         print(f"Error: PDF file not found: {pdf_path}")
         sys.exit(1)
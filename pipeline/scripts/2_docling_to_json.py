@@ -6,11 +6,15 @@ Simple rule: Section headers are provision boundaries.
 Everything between section headers is the provision content, formatted as markdown.
 """
 
-import json
 import re
 import sys
 from pathlib import Path
-from shared import slugify
+from shared import load_json, save_json, slugify
+
+# Numbered clauses: "1. ", "2 ", "(1)", "(2) ", etc.
+_NUMBERED_CLAUSE_RE = re.compile(r'^(\d+[\.\s]|\(\d+\))')
+# Lettered list items: "(a)", "(b)", "(i)", etc.
+_LETTERED_LIST_RE = re.compile(r'^\([a-z]\)')
 
 
 def infer_document_structure(texts: list) -> dict:
@@ -232,14 +236,12 @@ def extract_provisions(doc_dict: dict) -> list:
             is_left_aligned = any(abs(left_margin - margin) < 5 for margin in leftmost_margins)
 
             if is_left_aligned:
-                import re
                 # Exclude numbered clauses (they're content, not boundaries)
-                # Matches: "1. ", "2 ", "(1)", "(2) ", etc.
-                is_numbered_clause = bool(re.match(r'^(\d+[\.\s]|\(\d+\))', text))
+                is_numbered_clause = bool(_NUMBERED_CLAUSE_RE.match(text))
                 # Exclude quoted section names (they're content being added)
                 is_quoted = text.startswith("'") or text.startswith('"')
                 # Exclude list items like "(a)", "(b)", "(i)", etc.
-                is_lettered_list = bool(re.match(r'^\([a-z]\)', text))
+                is_lettered_list = bool(_LETTERED_LIST_RE.match(text))
 
                 # If it's left-aligned and not a numbered clause, quote, or lettered list, it's a section boundary
                 # Let LLM post-processing determine if it's a real provision or TOC/metadata
@@ -289,8 +291,7 @@ def create_bill_json(docling_json_path: str, force: bool = False):
         return
 
     # Load Docling JSON
-    with open(docling_path, 'r', encoding='utf-8') as f:
-        doc_dict = json.load(f)
+    doc_dict = load_json(docling_path)
 
     # Extract provisions
     provisions = extract_provisions(doc_dict)
@@ -340,8 +341,7 @@ def create_bill_json(docling_json_path: str, force: bool = False):
     }
 
     # Write output (output_path already defined at top of function)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(bill_data, f, indent=2, ensure_ascii=False)
+    save_json(output_path, bill_data)
 
     print("=" * 80)
     print(f"✓ Bill JSON created: {output_path}")
@@ -8,17 +8,20 @@ This script processes extracted bill sections and categorizes them into:
 - metadata: Table of contents, part headings, etc.
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import Literal
 import dspy
 from dotenv import load_dotenv
 import os
+from shared import load_json, restore_checkpoint, run_concurrently, save_json, write_checkpoint
 
 # Load environment variables
 load_dotenv()
 
+# Categorization is network-bound, so run several Gemini requests concurrently
+MAX_WORKERS = 16
+
 # Section category type
 SectionCategory = Literal["provision", "preamble", "metadata"]
 
@@ -54,6 +57,10 @@ def setup_dspy():
     return lm
 
 
+# Build the predictor once; it is reused across all sections and worker threads
+_CATEGORIZER = dspy.ChainOfThought(SectionCategorizer)
+
+
 def categorize_section(title: str, raw_text: str) -> dict:
     """Categorize a single section using DSPy.
 
@@ -64,14 +71,11 @@ def categorize_section(title: str, raw_text: str) -> dict:
     Returns:
         Dict with 'type' and 'reasoning' keys
     """
-    # Create predictor
-    categorizer = dspy.ChainOfThought(SectionCategorizer)
-
     # Get first 400 chars of content for preview
     content_preview = raw_text[:400] if raw_text else ""
 
     # Run categorization
-    result = categorizer(title=title, content_preview=content_preview)
+    result = _CATEGORIZER(title=title, content_preview=content_preview)
 
     return {
         "type": result.category,
@@ -91,8 +95,7 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     sections = bill_data.get('sections', [])
 
@@ -103,13 +106,21 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     print(f"Processing {len(sections)} sections")
     print()
 
-    # Categorize each section and batch disk writes
+    # Restore results checkpointed by an interrupted run
+    sidecar_path = json_path.with_suffix('.categories.jsonl')
+    resumed = restore_checkpoint(sidecar_path, sections, 'category')
+
+    if resumed:
+        print(f"Resuming: restored {len(resumed)} section(s) from {sidecar_path.name}")
+        print()
+
+    # Categorize sections concurrently
     category_counts = {"provision": 0, "preamble": 0, "metadata": 0}
-    BATCH_SIZE = 10  # Save every 10 sections
 
+    pending = []
     for i, section in enumerate(sections, 1):
-        # Skip if already categorized (unless force mode)
-        if 'category' in section and not force:
+        # Skip if already categorized (unless force mode) or restored from checkpoint
+        if section.get('index') in resumed or ('category' in section and not force):
             continue
 
         title = section['title']
@@ -125,29 +136,37 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
             category_counts["metadata"] += 1
             continue
 
-        # Categorize
-        category_result = categorize_section(title, raw_text)
-        category_type = category_result["type"]
+        pending.append(section)
+
+    categorized_count = 0
+
+    # Checkpoint each result to an append-only sidecar instead of rewriting the bill
+    sidecar = None if dry_run else open(sidecar_path, 'ab')
+
+    try:
+        tasks = [(section, (section['title'], section.get('rawText', ''))) for section in pending]
+        for section, category_result in run_concurrently(categorize_section, tasks, MAX_WORKERS):
+            category_type = category_result["type"]
 
-        # Update counts
-        category_counts[category_type] += 1
+            # Update counts
+            category_counts[category_type] += 1
 
-        # Add category hash to section
-        section['category'] = category_result
+            # Add category hash to section
+            section['category'] = category_result
+            categorized_count += 1
 
-        # Show progress
-        print(f"[{i}/{len(sections)}] {category_type.upper()}: {title[:60]}")
+            write_checkpoint(sidecar, section, 'category', category_result)
 
-        # Batch disk writes - save every BATCH_SIZE sections (unless dry run)
-        if not dry_run and i % BATCH_SIZE == 0:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(bill_data, f, indent=2, ensure_ascii=False)
-            print(f"  💾 Saved progress ({i}/{len(sections)})")
+            # Show progress
+            print(f"[{categorized_count}/{len(pending)}] {category_type.upper()}: {section['title'][:60]}")
+    finally:
+        if sidecar:
+            sidecar.close()
 
-    # Final save for remaining sections
+    # Merge all results into the bill with a single write, then drop the checkpoint
     if not dry_run:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bill_data, f, indent=2, ensure_ascii=False)
+        save_json(json_path, bill_data)
+        sidecar_path.unlink(missing_ok=True)
 
     print()
     print("Categorization complete!")
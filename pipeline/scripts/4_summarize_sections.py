@@ -6,16 +6,22 @@ This script processes categorized bill sections and generates accessible
 summaries that explain what each section does in simple language.
 """
 
-import json
 import sys
 from pathlib import Path
 import dspy
 from dotenv import load_dotenv
 import os
+from shared import load_json, run_concurrently, save_json
 
 # Load environment variables
 load_dotenv()
 
+# Summarization is network-bound, so run several Gemini requests concurrently
+MAX_WORKERS = 16
+
+# Longest provision text sent to the summarizer (0 disables truncation)
+SUMMARY_MAX_CHARS = int(os.getenv("SUMMARY_MAX_CHARS", "8000"))
+
 
 class SectionSummarizer(dspy.Signature):
     """Generate a plain language summary of a bill provision.
@@ -50,6 +56,31 @@ def setup_dspy():
     return lm
 
 
+# Build the predictor once; it is reused across all provisions and worker threads
+_SUMMARIZER = dspy.ChainOfThought(SectionSummarizer)
+
+
+def truncate_content(raw_text: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """Bound provision text to a character budget, keeping its beginning and end.
+
+    Long provisions (usually full schedules) otherwise inflate prompt tokens and
+    latency linearly; the opening and closing text carry most of their meaning.
+
+    Args:
+        raw_text: Full provision content
+        max_chars: Character budget (0 disables truncation)
+
+    Returns:
+        The original text, or its head and tail joined by a truncation marker
+    """
+    if max_chars <= 0 or len(raw_text) <= max_chars:
+        return raw_text
+
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    return raw_text[:head] + "\n\n[...content truncated...]\n\n" + raw_text[-tail:]
+
+
 def summarize_section(title: str, raw_text: str) -> str:
     """Generate a plain language summary for a single provision.
 
@@ -60,8 +91,7 @@ def summarize_section(title: str, raw_text: str) -> str:
     Returns:
         Plain language summary string
     """
-    summarizer = dspy.ChainOfThought(SectionSummarizer)
-    result = summarizer(title=title, content=raw_text)
+    result = _SUMMARIZER(title=title, content=truncate_content(raw_text))
 
     return result.summary
 
@@ -78,8 +108,7 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     sections = bill_data.get('sections', [])
 
@@ -90,51 +119,38 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     # Count provisions only
     provisions = [s for s in sections if s.get('category', {}).get('type') == 'provision']
 
+    # Skip provisions that are already summarized (unless force mode)
+    pending = [s for s in provisions if force or 'summary' not in s]
+
     print(f"Processing {len(sections)} sections total")
-    print(f"  Provisions to summarize: {len(provisions)}")
+    print(f"  Provisions to summarize: {len(pending)} of {len(provisions)}")
     print()
 
-    # Summarize each provision and batch disk writes
+    # Summarize provisions concurrently and batch disk writes
     summarized_count = 0
     BATCH_SIZE = 10  # Save every 10 provisions
 
-    for i, section in enumerate(sections, 1):
-        category = section.get('category', {}).get('type', 'unknown')
-
-        # Only process provisions
-        if category != 'provision':
-            continue
-
-        # Skip if already summarized (unless force mode)
-        if 'summary' in section and not force:
-            continue
-
-        title = section['title']
-        raw_text = section.get('rawText', '')
-
-        # Generate summary
-        summary = summarize_section(title, raw_text)
-
+    tasks = [(section, (section['title'], section.get('rawText', ''))) for section in pending]
+    for section, summary in run_concurrently(summarize_section, tasks, MAX_WORKERS):
         # Add summary to section
         section['summary'] = summary
         summarized_count += 1
 
         # Show progress
-        print(f"[{summarized_count}/{len(provisions)}] {title[:60]}")
+        print(f"[{summarized_count}/{len(pending)}] {section['title'][:60]}")
         print(f"  → {summary}")
         print()
 
         # Batch disk writes - save every BATCH_SIZE provisions (unless dry run)
+        # Checkpoints are compact; the final save below re-indents the file
         if not dry_run and summarized_count % BATCH_SIZE == 0:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(bill_data, f, indent=2, ensure_ascii=False)
-            print(f"  💾 Saved progress ({summarized_count}/{len(provisions)})")
+            save_json(json_path, bill_data, indent=False)
+            print(f"  💾 Saved progress ({summarized_count}/{len(pending)})")
             print()
 
     # Final save for remaining provisions
     if not dry_run:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bill_data, f, indent=2, ensure_ascii=False)
+        save_json(json_path, bill_data)
 
     print()
     print("Summarization complete!")
@@ -6,16 +6,25 @@ This script takes categorized, summarized, and impact-assessed provisions
 and generates a concise executive summary of the bill.
 """
 
-import json
 import sys
 from pathlib import Path
 import dspy
+import orjson
 from dotenv import load_dotenv
 import os
+from llm import check_api_key, get_lm
+from shared import load_json, save_json
 
 # Load environment variables
 load_dotenv()
 
+# Byte budget for the provisions JSON in the prompt. Over budget, the longest
+# provision summaries are shortened evenly; every provision stays included
+PROMPT_MAX_BYTES = int(os.getenv("EXEC_SUMMARY_MAX_BYTES", "32000"))
+
+# Summaries are never shortened below this many bytes
+MIN_SUMMARY_BYTES = 150
+
 
 class ExecutiveSummaryGenerator(dspy.Signature):
     """Generate a comprehensive executive summary for a Ghanaian bill.
@@ -43,20 +52,60 @@ class ExecutiveSummaryGenerator(dspy.Signature):
 
 
 def setup_dspy():
-    """Initialize DSPy with Claude Sonnet model."""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("Error: ANTHROPIC_API_KEY not found in environment variables")
-        print("Please create a .env file with your Anthropic API key")
-        print("See .env.example for template")
-        sys.exit(1)
+    """Create the Claude Sonnet model (scoped by callers, see llm.py)."""
+    check_api_key()
 
     # Using Claude Sonnet 4.5 for executive summary generation (better quality for synthesis)
     # temperature=0 for consistent outputs
-    lm = dspy.LM(model="claude-sonnet-4-5", api_key=api_key, temperature=0)
-    dspy.configure(lm=lm)
+    return get_lm("claude-sonnet-4-5", temperature=0)
+
+
+# Build the predictor once; it is reused for every bill
+_GENERATOR = dspy.ChainOfThought(ExecutiveSummaryGenerator)
+
+
+def summary_length_cap(lengths: list, available: int):
+    """Find the largest per-summary length whose total fits the available space.
+
+    Summaries shorter than the cap keep their full length, leaving more room
+    for the longer ones.
+
+    Args:
+        lengths: Encoded size of each provision summary, in bytes
+        available: Total bytes available for summaries
+
+    Returns:
+        Maximum bytes per summary, or None if all summaries already fit
+    """
+    remaining = available
+    lengths = sorted(lengths)
+    for count, length in enumerate(lengths):
+        share = remaining // (len(lengths) - count)
+        if length > share:
+            return share
+        remaining -= length
+    return None
+
+
+def encoded_size(text: str) -> int:
+    """Size of text as a JSON string in the prompt, counting quotes, escapes and multibyte characters."""
+    return len(orjson.dumps(text))
+
+
+def shorten(text: str, max_bytes: int) -> str:
+    """Shorten text at a word boundary so its encoded size is at most max_bytes."""
+    if encoded_size(text) <= max_bytes:
+        return text
 
-    return lm
+    # Escapes and multibyte characters take several bytes each, so cut back by
+    # the overshoot until the shortened text fits
+    chars = max_bytes
+    while True:
+        shortened = text[:chars - 1].rsplit(' ', 1)[0] + '…'
+        overshoot = encoded_size(shortened) - max_bytes
+        if overshoot <= 0 or chars == 1:
+            return shortened
+        chars = max(chars - overshoot, 1)
 
 
 def generate_executive_summary(bill_title: str, sections: list) -> str:
@@ -96,12 +145,23 @@ def generate_executive_summary(bill_title: str, sections: list) -> str:
                 'summary': section.get('summary', '')
             })
 
-    # Convert to JSON string for the LLM
-    sections_json = json.dumps(relevant_sections, indent=2)
+    # Convert to compact JSON for the LLM, trimming summaries to fit the byte budget
+    sections_json = orjson.dumps(relevant_sections)
+    if len(sections_json) > PROMPT_MAX_BYTES:
+        provisions = [s for s in relevant_sections if s['type'] == 'provision']
+        summary_sizes = [encoded_size(s['summary']) for s in provisions]
+        available = PROMPT_MAX_BYTES - (len(sections_json) - sum(summary_sizes))
+        cap = summary_length_cap(summary_sizes, available)
+        if cap is not None:
+            cap = max(cap, MIN_SUMMARY_BYTES)
+            for section in provisions:
+                section['summary'] = shorten(section['summary'], cap)
+            sections_json = orjson.dumps(relevant_sections)
+
+    sections_json = sections_json.decode('utf-8')
 
     # Generate summary
-    generator = dspy.ChainOfThought(ExecutiveSummaryGenerator)
-    result = generator(bill_title=bill_title, provisions_summary=sections_json)
+    result = _GENERATOR(bill_title=bill_title, provisions_summary=sections_json)
 
     return result.executive_summary
 
@@ -118,8 +178,7 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     # Check if already has executive summary
     if 'executiveSummary' in bill_data and not force:
@@ -172,8 +231,7 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     bill_data['executiveSummary'] = executive_summary
 
     # Save
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(bill_data, f, indent=2, ensure_ascii=False)
+    save_json(json_path, bill_data)
 
     print(f"✓ Saved executive summary to: {json_path.name}")
 
@@ -202,13 +260,14 @@ def main():
 
     # Setup DSPy
     print("Initializing DSPy...")
-    setup_dspy()
+    lm = setup_dspy()
     print("✓ DSPy initialized")
     print()
 
     # Process the bill
     try:
-        process_bill(bill_path, dry_run=dry_run, force=force)
+        with dspy.context(lm=lm):
+            process_bill(bill_path, dry_run=dry_run, force=force)
     except Exception as e:
         print(f"Error processing {bill_path.name}: {e}")
         import traceback
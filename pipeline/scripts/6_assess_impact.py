@@ -7,17 +7,64 @@ This script processes bill provisions and determines their impact level
 tagged with topics in the next step.
 """
 
-import json
+import hashlib
+import re
+import sqlite3
 import sys
 from pathlib import Path
 import dspy
+import orjson
 from dotenv import load_dotenv
 import os
-from shared import TOPICS, ImpactLevel
+import message_batches
+from llm import check_api_key, get_lm
+from prompt_cache import CachedPrefixAdapter
+from shared import (
+    TOPICS, ImpactLevel, load_json, open_sqlite_cache, restore_checkpoint, run_concurrently, save_json,
+    signature_version, worst_negative, write_checkpoint
+)
 
 # Load environment variables
 load_dotenv()
 
+# Assessment is network-bound, so keep several Claude requests in flight
+# (bounded to stay within Anthropic rate limits)
+MAX_WORKERS = 10
+
+# Provisions assessed per LLM call; larger batches mean fewer requests but
+# less consistent ratings, and 1 disables batching
+PROVISIONS_PER_CALL = max(1, int(os.getenv("IMPACT_PROVISIONS_PER_CALL", "8")))
+
+# Cross-bill store of assessments keyed by provision text (in the bill's output
+# directory), so amended bills and new versions reuse results for unchanged clauses
+IMPACT_CACHE_NAME = ".impact_cache.sqlite"
+
+# Output token cap per assessment (four levels, reasoning, confidence), so a
+# runaway response is cut off instead of running to the model's default limit
+ASSESSMENT_MAX_TOKENS = 1024
+
+# Message Batches API (--batch): model (responses are capped at ASSESSMENT_MAX_TOKENS)
+BATCH_MODEL = "claude-haiku-4-5"
+
+# Per-topic keys in JSON assessments, in TOPICS order
+TOPIC_FIELDS = ("digital_innovation", "freedom_of_speech", "privacy_data_rights", "business_environment")
+
+# Valid impact level strings, for validating JSON assessments
+_LEVEL_VALUES = frozenset(level.value for level in ImpactLevel)
+
+# Short procedural provisions (titles like "Commencement" or "Repeal and savings")
+# are rated neutral without an LLM call; longer ones may carry real substance
+_PROCEDURAL_TITLE_RE = re.compile(
+    r"^(short title|commencement|interpretation|repeals?|savings?|transitional|citation)\b", re.I
+)
+PROCEDURAL_MAX_CHARS = 400
+
+NEUTRAL_IMPACT = {
+    "levels": {topic: ImpactLevel.Neutral.value for topic in TOPICS},
+    "reasoning": "Procedural provision with no substantive effect; rated neutral without LLM assessment.",
+    "confidence": 0.9,
+}
+
 
 class ImpactAssessor(dspy.Signature):
     """Assess the impact level of a bill provision for each topic area.
@@ -116,30 +163,92 @@ class ImpactAssessor(dspy.Signature):
     title: str = dspy.InputField(desc="The provision title")
     content: str = dspy.InputField(desc="The full provision content")
 
-    digital_innovation_impact: ImpactLevel = dspy.OutputField(desc="Impact level on Digital Innovation")
-    freedom_of_speech_impact: ImpactLevel = dspy.OutputField(desc="Impact level on Freedom of Speech")
-    privacy_data_rights_impact: ImpactLevel = dspy.OutputField(desc="Impact level on Privacy & Data Rights")
-    business_environment_impact: ImpactLevel = dspy.OutputField(desc="Impact level on Business Environment")
+    reasoning: str = dspy.OutputField(desc="Brief justification (at most 50 words) citing the specific clause")
+    impacts_json: str = dspy.OutputField(
+        desc='JSON object with an impact level per topic: {"digital_innovation": ..., "freedom_of_speech": ..., '
+             '"privacy_data_rights": ..., "business_environment": ...}'
+    )
     confidence: float = dspy.OutputField(desc="Confidence score from 0.0 to 1.0")
 
 
+class BatchImpactAssessor(dspy.Signature):
+    """Assess several provisions in one response.
+
+    Assess each provision in the array independently, applying the framework above to it exactly as if
+    it were the only provision given. Return one assessment per provision, using the provision's id.
+    """
+
+    bill_context: str = dspy.InputField(desc="Executive summary providing context about what the bill does")
+    provisions_json: str = dspy.InputField(desc="JSON array of provisions: [{id, title, content}]")
+
+    assessments_json: str = dspy.OutputField(
+        desc="JSON array with one object per provision: [{id, reasoning, digital_innovation, "
+             "freedom_of_speech, privacy_data_rights, business_environment, confidence}]. "
+             "reasoning is a brief justification (at most 50 words) citing the specific clause; "
+             "each topic value is an impact level; confidence is a score from 0.0 to 1.0"
+    )
+
+
+# Same rubric as ImpactAssessor, followed by the batch-specific instructions
+BatchImpactAssessor = BatchImpactAssessor.with_instructions(
+    ImpactAssessor.instructions + "\n\n" + BatchImpactAssessor.instructions
+)
+
+
 def setup_dspy():
-    """Initialize DSPy with Claude Haiku model."""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("Error: ANTHROPIC_API_KEY not found in environment variables")
-        print("Please create a .env file with your Anthropic API key")
-        print("See .env.example for template")
-        sys.exit(1)
+    """Create the Claude Haiku model (scoped by callers, see llm.py)."""
+    check_api_key()
 
     # Using Claude Haiku 4.5 for detailed impact assessment
-    lm = dspy.LM(model="claude-haiku-4-5", api_key=api_key)
-    dspy.configure(lm=lm)
+    return get_lm("claude-haiku-4-5")
+
 
-    return lm
+# The rubric and bill_context are identical for every provision in a bill,
+# so cache the prompt up to the per-provision fields and only pay for it once
+ADAPTER = CachedPrefixAdapter(split_before=("title", "provisions_json"))
 
 
-def assess_impact(bill_context: str, title: str, raw_text: str) -> dict:
+# Build the predictors once; they are reused across all provisions and worker threads.
+# The signatures ask for short reasoning fields themselves, so no CoT
+_ASSESSOR = dspy.Predict(ImpactAssessor)
+_BATCH_ASSESSOR = dspy.Predict(BatchImpactAssessor)
+
+
+def parse_levels(impacts_json: str, title: str) -> tuple[dict, bool]:
+    """Parse and validate per-topic impact levels from a JSON object.
+
+    Missing or invalid levels fall back to neutral with a warning instead of
+    paying for another LLM round-trip.
+
+    Args:
+        impacts_json: JSON object keyed by TOPIC_FIELDS, possibly wrapped in prose or code fences
+        title: Provision title, for warnings
+
+    Returns:
+        Tuple of (dict with topic names as keys and impact levels as values,
+        True if every level parsed without falling back to neutral)
+    """
+    try:
+        data = orjson.loads(impacts_json[impacts_json.index('{'):impacts_json.rindex('}') + 1])
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    levels = {}
+    valid = True
+    for topic, field in zip(TOPICS, TOPIC_FIELDS):
+        level = data.get(field)
+        if level not in _LEVEL_VALUES:
+            print(f"  ⚠ Invalid {topic} level {level!r} for {title[:50]}; using neutral")
+            level = ImpactLevel.Neutral.value
+            valid = False
+        levels[topic] = level
+
+    return levels, valid
+
+
+def assess_impact(bill_context: str, title: str, raw_text: str) -> tuple[dict, bool]:
     """Assess the impact level of a provision for each topic area.
 
     Args:
@@ -148,43 +257,219 @@ def assess_impact(bill_context: str, title: str, raw_text: str) -> dict:
         raw_text: Full provision content
 
     Returns:
-        Dict with topic names as keys and impact levels as values
-        Example: {
-            "Digital Innovation": "high",
-            "Freedom of Speech": "none",
-            "Privacy & Data Rights": "medium",
-            "Business Environment": "high"
+        Tuple of (dict with per-topic levels, reasoning, and confidence,
+        True if every level parsed cleanly and the result may be cached)
+        Example result: {
+            "levels": {
+                "Digital Innovation": "high-negative",
+                "Freedom of Speech": "neutral",
+                "Privacy & Data Rights": "medium-positive",
+                "Business Environment": "high-negative"
+            },
+            "reasoning": "...",
+            "confidence": 0.8
         }
     """
-    assessor = dspy.ChainOfThought(ImpactAssessor)
-    result = assessor(bill_context=bill_context, title=title, content=raw_text)
+    result = _ASSESSOR(
+        bill_context=bill_context, title=title, content=raw_text, config={"max_tokens": ASSESSMENT_MAX_TOKENS}
+    )
+
+    levels, valid = parse_levels(result.impacts_json, title)
 
     return {
-        "levels": {
-            TOPICS[0]: result.digital_innovation_impact.value,
-            TOPICS[1]: result.freedom_of_speech_impact.value,
-            TOPICS[2]: result.privacy_data_rights_impact.value,
-            TOPICS[3]: result.business_environment_impact.value
-        },
+        "levels": levels,
         "reasoning": result.reasoning,
         "confidence": result.confidence,
-    }
+    }, valid
+
+
+def is_procedural(title: str, raw_text: str) -> bool:
+    """Check whether a provision is short procedural boilerplate.
+
+    Args:
+        title: Provision title
+        raw_text: Full provision content
+
+    Returns:
+        True if the provision can be rated neutral without an LLM call
+    """
+    return len(raw_text) < PROCEDURAL_MAX_CHARS and _PROCEDURAL_TITLE_RE.match(title) is not None
+
+
+def assess_impact_batch(bill_context: str, provisions: list) -> dict:
+    """Assess several provisions in a single LLM call.
+
+    Args:
+        bill_context: Executive summary providing bill context
+        provisions: Provision sections to assess
+
+    Returns:
+        Dict mapping section index to an assess_impact()-style result dict.
+        Provisions missing from or malformed in the response are left out.
+    """
+    # Section ids repeat within a bill, so the unique index is used as the id
+    payload = [
+        {"id": s['index'], "title": s['title'], "content": s.get('rawText', '')}
+        for s in provisions
+    ]
+
+    result = _BATCH_ASSESSOR(
+        bill_context=bill_context,
+        provisions_json=orjson.dumps(payload).decode('utf-8'),
+        config={"max_tokens": ASSESSMENT_MAX_TOKENS * len(provisions)},
+    )
+
+    # Tolerate prose or code fences around the array
+    text = result.assessments_json
+    try:
+        entries = orjson.loads(text[text.index('['):text.rindex(']') + 1])
+    except ValueError:
+        return {}
+
+    expected = {s['index'] for s in provisions}
+    results = {}
+    for entry in entries:
+        try:
+            index = int(entry['id'])
+            levels = {topic: ImpactLevel(entry[field]).value for topic, field in zip(TOPICS, TOPIC_FIELDS)}
+            confidence = float(entry['confidence'])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        if index in expected:
+            results[index] = {
+                "levels": levels,
+                "reasoning": str(entry.get('reasoning', '')),
+                "confidence": confidence,
+            }
+
+    return results
+
 
+def assess_provisions(bill_context: str, provisions: list) -> dict:
+    """Assess a group of provisions, batching them into one call when possible.
 
-def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
+    Any provision the batched call fails to return is assessed on its own.
+
+    Args:
+        bill_context: Executive summary providing bill context
+        provisions: Provision sections to assess
+
+    Returns:
+        Dict mapping section index to (impact result, True if it may be cached)
+    """
+    results = {}
+    if len(provisions) > 1:
+        try:
+            # The batched response is only accepted when every level is valid
+            results = {
+                index: (result, True) for index, result in assess_impact_batch(bill_context, provisions).items()
+            }
+        except Exception as e:
+            print(f"  ⚠ Batched assessment failed, assessing individually: {e}")
+
+    for section in provisions:
+        if section['index'] not in results:
+            results[section['index']] = assess_impact(bill_context, section['title'], section.get('rawText', ''))
+
+    return results
+
+
+# Cached assessments only match the prompts they were made with (most come from
+# BatchImpactAssessor); any change to either signature starts a fresh cache generation
+SIGNATURE_VERSION = signature_version(ImpactAssessor, BatchImpactAssessor)
+
+
+def open_impact_cache(output_dir: Path, dry_run: bool = False) -> sqlite3.Connection:
+    """Open (creating if needed) the cross-bill impact cache.
+
+    Args:
+        output_dir: Directory holding the bill JSON files
+        dry_run: If True, read the cache without creating or writing it
+
+    Returns:
+        SQLite connection; only use it from the thread that opened it
+    """
+    return open_sqlite_cache(
+        output_dir / IMPACT_CACHE_NAME,
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(text_hash TEXT PRIMARY KEY, signature_version TEXT, impact_json TEXT)",
+        read_only=dry_run,
+    )
+
+
+def provision_hash(section: dict) -> str:
+    """Hash a provision's title and text for impact cache lookups.
+
+    The bill context is deliberately left out, so identical clauses match
+    across bills and versions.
+    """
+    text = f"{section['title']}\n{section.get('rawText', '')}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def assess_with_message_batch(json_path: Path, bill_context: str, provisions: list) -> dict:
+    """Assess provisions through Anthropic's Message Batches API.
+
+    Args:
+        json_path: Path to bill JSON file (the in-flight batch id is saved next to it)
+        bill_context: Executive summary providing bill context
+        provisions: Provision sections to assess
+
+    Returns:
+        Dict mapping section index to (impact result, True if it may be cached);
+        failed items are left out
+    """
+    by_custom_id = {f"section-{s['index']}": s for s in provisions}
+    requests = [
+        message_batches.build_request(
+            ADAPTER, ImpactAssessor, custom_id,
+            {"bill_context": bill_context, "title": s['title'], "content": s.get('rawText', '')},
+            model=BATCH_MODEL, max_tokens=ASSESSMENT_MAX_TOKENS,
+        )
+        for custom_id, s in by_custom_id.items()
+    ]
+
+    texts = message_batches.run_batch(requests, json_path.with_suffix('.impacts.batch_id'))
+
+    results = {}
+    for custom_id, text in texts.items():
+        section = by_custom_id.get(custom_id)
+        if section is None:
+            continue
+
+        try:
+            fields = ADAPTER.parse(ImpactAssessor, text)
+        except Exception:
+            continue
+
+        levels, valid = parse_levels(fields['impacts_json'], section['title'])
+        results[section['index']] = ({
+            "levels": levels,
+            "reasoning": fields['reasoning'],
+            "confidence": fields['confidence'],
+        }, valid)
+
+    return results
+
+
+def process_bill(json_path: Path, dry_run: bool = False, force: bool = False, force_all: bool = False,
+                 batch: bool = False, reuse_cache: bool = False):
     """Process a bill JSON file and assess impact for all provisions.
 
     Args:
         json_path: Path to bill JSON file
         dry_run: If True, only show assessments without saving
-        force: If True, reassess even if impact already exists
+        force: If True, reassess even if impact already exists (with the LLM, not the cache)
+        force_all: If True, also send procedural provisions to the LLM
+        batch: If True, use the Message Batches API (half price, slow turnaround)
+        reuse_cache: If True, reuse cached assessments even in force mode (ignored in force-all mode)
     """
     print(f"\nProcessing: {json_path.name}")
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     sections = bill_data.get('sections', [])
 
@@ -201,57 +486,136 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     # Count provisions only
     provisions = [s for s in sections if s.get('category', {}).get('type') == 'provision']
 
-    print(f"Processing {len(sections)} sections total")
-    print(f"  Provisions to assess: {len(provisions)}")
-    print()
+    # Restore results checkpointed by an interrupted run (only provisions are checkpointed)
+    sidecar_path = json_path.with_suffix('.impacts.jsonl')
+    resumed = restore_checkpoint(sidecar_path, provisions, 'impact')
 
-    # Assess each provision and batch disk writes
-    assessed_count = 0
-    BATCH_SIZE = 10  # Save every 10 provisions
+    if resumed:
+        print(f"Resuming: restored {len(resumed)} provision(s) from {sidecar_path.name}")
+        print()
 
-    for i, section in enumerate(sections, 1):
-        category = section.get('category', {}).get('type', 'unknown')
+    # Skip provisions that are already assessed (unless force mode) or restored from checkpoint
+    pending = [
+        s for s in provisions
+        if s.get('index') not in resumed and (force or 'impact' not in s)
+    ]
 
-        # Only process provisions
-        if category != 'provision':
-            continue
+    print(f"Processing {len(sections)} sections total")
+    print(f"  Provisions to assess: {len(pending)} of {len(provisions)}")
+    print()
 
-        # Skip if already assessed (unless force mode)
-        if 'impact' in section and not force:
-            continue
+    # Rate short procedural provisions directly (unless force-all mode)
+    procedural_count = 0
+    if not force_all:
+        substantive = []
+        for section in pending:
+            if is_procedural(section['title'], section.get('rawText', '')):
+                section['impact'] = {**NEUTRAL_IMPACT, "levels": dict(NEUTRAL_IMPACT["levels"])}
+                print(f"[SKIP] {section['title'][:60]} - procedural, rated neutral")
+            else:
+                substantive.append(section)
+
+        procedural_count = len(pending) - len(substantive)
+        if procedural_count:
+            pending = substantive
+            print()
 
-        title = section['title']
-        raw_text = section.get('rawText', '')
+    # Assess groups of provisions concurrently
+    assessed_count = 0
+    cached_count = 0
+    total = len(pending)
 
-        # Assess impact for each topic
-        result = assess_impact(executive_summary, title, raw_text)
+    # Checkpoint each result to an append-only sidecar instead of rewriting the bill
+    sidecar = None if dry_run else open(sidecar_path, 'ab')
+    impact_cache = open_impact_cache(json_path.parent, dry_run=dry_run)
+
+    def record(section: dict, result: dict, store: bool = True):
+        """Apply one assessment to its section, checkpoint it, and show progress."""
+        nonlocal assessed_count
 
         # Add impacts to section
         section['impact'] = result
         assessed_count += 1
 
+        write_checkpoint(sidecar, section, 'impact', result)
+
+        # Results whose levels fell back to neutral stay out of the cross-bill cache
+        if store and not dry_run:
+            impact_cache.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (provision_hash(section), SIGNATURE_VERSION, orjson.dumps(result).decode('utf-8'))
+            )
+            # Commit each entry so parallel bills aren't locked out for this whole run
+            impact_cache.commit()
+
         # Show progress
-        print(f"[{assessed_count}/{len(provisions)}] {title[:60]}")
+        print(f"[{assessed_count}/{total}] {section['title'][:60]}")
         print(f"  Confidence: {result['confidence']}")
         for topic, level in result['levels'].items():
             if level != "none":
                 print(f"  {topic}: {level.upper()}")
 
-        # Batch disk writes - save every BATCH_SIZE provisions (unless dry run)
-        if not dry_run and assessed_count % BATCH_SIZE == 0:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(bill_data, f, indent=2, ensure_ascii=False)
-            print(f"  💾 Saved progress ({assessed_count}/{len(provisions)})")
-            print()
-
-    # Final save for remaining provisions
+    try:
+        # Reuse assessments of identical provisions from earlier runs (unless force
+        # mode asks for fresh ones)
+        if not force_all and (reuse_cache or not force):
+            uncached = []
+            for section in pending:
+                row = impact_cache.execute(
+                    "SELECT impact_json FROM cache WHERE text_hash = ? AND signature_version = ?",
+                    (provision_hash(section), SIGNATURE_VERSION)
+                ).fetchone()
+                if row:
+                    record(section, orjson.loads(row[0]), store=False)
+                    cached_count += 1
+                else:
+                    uncached.append(section)
+            pending = uncached
+
+        # Batch mode: submit everything as one Message Batch, then assess any
+        # failed items synchronously below
+        if batch and pending:
+            batch_results = assess_with_message_batch(json_path, executive_summary, pending)
+            for section in pending:
+                if section['index'] in batch_results:
+                    result, cacheable = batch_results[section['index']]
+                    record(section, result, store=cacheable)
+
+            pending = [s for s in pending if s['index'] not in batch_results]
+            if pending:
+                print(f"\nAssessing {len(pending)} failed batch item(s) synchronously")
+
+        chunks = [pending[i:i + PROVISIONS_PER_CALL] for i in range(0, len(pending), PROVISIONS_PER_CALL)]
+
+        tasks = [(chunk, (executive_summary, chunk)) for chunk in chunks]
+        for chunk, results in run_concurrently(assess_provisions, tasks, MAX_WORKERS):
+            for section in chunk:
+                result, cacheable = results[section['index']]
+                record(section, result, store=cacheable)
+    finally:
+        if sidecar:
+            sidecar.close()
+        impact_cache.close()
+
+    # Denormalize each provision's worst negative impact for step 8, which would
+    # otherwise rescan every topic of every provision. Every run refreshes it for
+    # all provisions, so it also backfills older runs and picks up hand-edited levels
+    for section in provisions:
+        if section.get('impact'):
+            section['impact']['worstNegative'] = worst_negative(section['impact'].get('levels', {}))
+
+    # Merge all results into the bill with a single write, then drop the checkpoint
     if not dry_run:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bill_data, f, indent=2, ensure_ascii=False)
+        save_json(json_path, bill_data)
+        sidecar_path.unlink(missing_ok=True)
 
     print()
     print("Impact assessment complete!")
     print(f"  Assessed {assessed_count} provisions")
+    if cached_count:
+        print(f"  Reused {cached_count} unchanged provision(s) from {IMPACT_CACHE_NAME}")
+    if procedural_count:
+        print(f"  Rated {procedural_count} procedural provision(s) neutral without LLM")
     print()
 
     if dry_run:
@@ -263,17 +627,24 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python 6_assess_impact.py <bill-json-path> [--dry-run] [--force]")
+        print("Usage: python 6_assess_impact.py <bill-json-path> [--dry-run] [--force] [--force-cached] [--force-all] "
+              "[--batch]")
         print()
         print("Example:")
         print("  python 6_assess_impact.py 'output/1. National Information Technology Authority (Amendment) Bill.json'")
         print("  python 6_assess_impact.py output/bill.json --dry-run  # Test without saving")
-        print("  python 6_assess_impact.py output/bill.json --force    # Reassess all provisions")
+        print("  python 6_assess_impact.py output/bill.json --force    # Reassess all with the LLM")
+        print("  python 6_assess_impact.py output/bill.json --force-cached  # Reassess all (reuses cached provisions)")
+        print("  python 6_assess_impact.py output/bill.json --force-all  # Also reassess procedural provisions")
+        print("  python 6_assess_impact.py output/bill.json --batch    # Half-price Message Batches (slow)")
         sys.exit(1)
 
     # Check for flags
     dry_run = "--dry-run" in sys.argv
-    force = "--force" in sys.argv or "-f" in sys.argv
+    force_all = "--force-all" in sys.argv
+    reuse_cache = "--force-cached" in sys.argv
+    force = force_all or reuse_cache or "--force" in sys.argv or "-f" in sys.argv
+    batch = "--batch" in sys.argv
 
     # Get single bill path
     bill_path = Path(sys.argv[1])
@@ -284,13 +655,16 @@ def main():
 
     # Setup DSPy
     print("Initializing DSPy...")
-    setup_dspy()
+    lm = setup_dspy()
     print("✓ DSPy initialized")
     print()
 
     # Process the bill
     try:
-        process_bill(bill_path, dry_run=dry_run, force=force)
+        with dspy.context(lm=lm, adapter=ADAPTER):
+            process_bill(
+                bill_path, dry_run=dry_run, force=force, force_all=force_all, batch=batch, reuse_cache=reuse_cache
+            )
     except Exception as e:
         print(f"Error processing {bill_path.name}: {e}")
         import traceback
@@ -57,6 +57,10 @@ def setup_dspy():
     return lm
 
 
+# Build the predictor once; it is reused for every topic
+_ANALYZER = dspy.ChainOfThought(TopicImpactAnalyzer)
+
+
 def generate_topic_impact_analysis(bill_context: str, topic: str, bill_title: str, provisions: list) -> dict:
     """Generate impact analysis for a specific topic.
 
@@ -73,8 +77,7 @@ def generate_topic_impact_analysis(bill_context: str, topic: str, bill_title: st
     provisions_json = json.dumps(provisions, indent=2)
 
     # Generate analysis
-    analyzer = dspy.ChainOfThought(TopicImpactAnalyzer)
-    result = analyzer(bill_context=bill_context, topic=topic, bill_title=bill_title, provisions_summary=provisions_json)
+    result = _ANALYZER(bill_context=bill_context, topic=topic, bill_title=bill_title, provisions_summary=provisions_json)
 
     return {
         "score": result.overall_impact.value,
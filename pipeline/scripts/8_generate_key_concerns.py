@@ -6,19 +6,54 @@ This script identifies the most critical issues in a bill based on
 severe/high impact provisions and generates structured concerns.
 """
 
-import json
+import hashlib
+import sqlite3
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List
 import dspy
 from dotenv import load_dotenv
 import os
-import re
-from shared import TOPICS, Topic, Severity
+import orjson
+import message_batches
+from llm import check_api_key, get_lm
+from prompt_cache import CachedPrefixAdapter
+from shared import (
+    Topic, Severity, load_json, open_sqlite_cache, read_checkpoint, run_concurrently, save_json, signature_version,
+    slugify, worst_negative, write_checkpoint
+)
 
 # Load environment variables
 load_dotenv()
 
+# Concern generation is network-bound, so keep several Claude requests in flight
+# (Sonnet has tighter rate limits than Haiku, hence fewer than step 6)
+MAX_WORKERS = 8
+
+# When several bills are given, each runs in its own process; MAX_WORKERS is split
+# between them so the total number of in-flight requests stays the same
+BILL_WORKERS = max(1, int(os.getenv("KEY_CONCERNS_BILL_WORKERS", str(min(os.cpu_count() or 1, 4)))))
+
+# Output token cap per concern (title, 2-3 sentence description, severity), so a
+# runaway response is cut off instead of running to the model's default limit
+CONCERN_MAX_TOKENS = 512
+
+# Cross-bill store of generated concerns keyed by provision content (in the bill's
+# output directory), so boilerplate clauses shared between bills are generated once
+CONCERN_CACHE_NAME = ".concern_cache.sqlite"
+
+# Sort rank of each severity (critical > high > medium > low), in Severity declaration order
+_SEVERITY_ORDER = {severity.value: rank for rank, severity in enumerate(Severity)}
+
+# Message Batches API (--batch): model (responses are capped at CONCERN_MAX_TOKENS)
+BATCH_MODEL = "claude-sonnet-4-5"
+
+# Provisions packed into one concern-generation call; the instructions and bill
+# context are sent once per group instead of once per provision
+CONCERNS_PER_CALL = max(1, int(os.getenv("KEY_CONCERNS_PER_CALL", "5")))
+
 
 class KeyConcernGenerator(dspy.Signature):
     """Generate a key concern from a single high-impact provision.
@@ -70,30 +105,77 @@ class KeyConcernGenerator(dspy.Signature):
     severity: Severity = dspy.OutputField(desc="Severity level: critical, high, medium or low")
 
 
+class BatchKeyConcernGenerator(dspy.Signature):
+    """Generate one key concern for each of several high-impact provisions.
+
+    Treat each provision in the array independently, applying the guidance above to it exactly as if
+    it were the only provision given. Return one concern per provision, using the provision's id.
+    """
+
+    bill_context: str = dspy.InputField(desc="Executive summary providing context about what the bill does")
+    provisions_json: str = dspy.InputField(
+        desc="JSON array of provisions: [{id, topic, title, raw_text, summary, impact_reasoning, impact_level}]"
+    )
+
+    concerns_json: str = dspy.OutputField(
+        desc="JSON array with one object per provision: [{id, title, description, severity}]. "
+             "title is 5-8 words; description is 2-3 sentences using markdown formatting; "
+             "severity is critical, high, medium or low"
+    )
+
+
+# Same guidance as KeyConcernGenerator, followed by the batch-specific instructions
+BatchKeyConcernGenerator = BatchKeyConcernGenerator.with_instructions(
+    KeyConcernGenerator.instructions + "\n\n" + BatchKeyConcernGenerator.instructions
+)
+
+
 def setup_dspy():
-    """Initialize DSPy with Claude Sonnet model."""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("Error: ANTHROPIC_API_KEY not found in environment variables")
-        print("Please create a .env file with your Anthropic API key")
-        print("See .env.example for template")
-        sys.exit(1)
+    """Create the Claude Sonnet model (scoped by callers, see llm.py)."""
+    check_api_key()
 
     # Using Claude Sonnet 4.5 for key concerns (better at identifying critical issues)
     # temperature=0 for consistent outputs
-    lm = dspy.LM(model="claude-sonnet-4-5", api_key=api_key, temperature=0)
-    dspy.configure(lm=lm)
+    return get_lm("claude-sonnet-4-5", temperature=0)
 
-    return lm
 
+# The instructions and bill_context are identical for every concern in a bill,
+# so cache the prompt up to the per-provision fields and only pay for it once
+ADAPTER = CachedPrefixAdapter(split_before=("topic", "provisions_json"))
 
-def slugify(text: str) -> str:
-    """Convert text to a URL-friendly slug."""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'\s+', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')
+# Build the predictors once; they are reused across all provisions and worker threads.
+# The inputs already carry step 6's impact reasoning, so no CoT
+_GENERATOR = dspy.Predict(KeyConcernGenerator)
+_BATCH_GENERATOR = dspy.Predict(BatchKeyConcernGenerator)
+
+
+def concern_inputs(bill_context: str, topic: str, provision: dict) -> dict:
+    """Build KeyConcernGenerator inputs for a provision."""
+    return {
+        "bill_context": bill_context,
+        "topic": topic,
+        "provision_title": provision['title'],
+        "provision_raw_text": provision['raw_text'],
+        "provision_summary": provision['summary'],
+        "impact_reasoning": provision['impact_reasoning'],
+        "impact_level": provision['impact_level'],
+    }
+
+
+def severity_rank(concern: dict) -> int:
+    """Sort key placing more severe concerns first (unknown severities last)."""
+    return _SEVERITY_ORDER.get(concern['severity'], 99)
+
+
+def make_concern(provision: dict, title: str, description: str, severity: Severity) -> dict:
+    """Build a concern dict from generated fields."""
+    return {
+        "id": slugify(title),
+        "title": title,
+        "severity": severity.value,
+        "description": description,
+        "relatedProvisions": [provision['id']]
+    }
 
 
 def generate_key_concern(bill_context: str, topic: str, provision: dict) -> dict:
@@ -108,40 +190,187 @@ def generate_key_concern(bill_context: str, topic: str, provision: dict) -> dict
         Concern dict with id, title, description, severity, relatedProvisions
     """
     # Generate concern
-    generator = dspy.ChainOfThought(KeyConcernGenerator)
-    result = generator(
+    result = _GENERATOR(**concern_inputs(bill_context, topic, provision), config={"max_tokens": CONCERN_MAX_TOKENS})
+
+    return make_concern(provision, result.title, result.description, result.severity)
+
+
+def generate_key_concerns_packed(bill_context: str, provisions: list) -> dict:
+    """Generate concerns for several provisions in a single LLM call.
+
+    Args:
+        bill_context: Executive summary for context
+        provisions: Provision dicts, as for generate_key_concern()
+
+    Returns:
+        Dict mapping position in provisions to concern.
+        Provisions missing from or malformed in the response are left out.
+    """
+    # Provisions are identified by their position in the group
+    payload = [
+        {
+            "id": i,
+            "topic": provision['topic'],
+            "title": provision['title'],
+            "raw_text": provision['raw_text'],
+            "summary": provision['summary'],
+            "impact_reasoning": provision['impact_reasoning'],
+            "impact_level": provision['impact_level'],
+        }
+        for i, provision in enumerate(provisions)
+    ]
+
+    result = _BATCH_GENERATOR(
         bill_context=bill_context,
-        topic=topic,
-        provision_title=provision['title'],
-        provision_raw_text=provision['raw_text'],
-        provision_summary=provision['summary'],
-        impact_reasoning=provision['impact_reasoning'],
-        impact_level=provision['impact_level']
+        provisions_json=orjson.dumps(payload).decode('utf-8'),
+        config={"max_tokens": CONCERN_MAX_TOKENS * len(provisions)},
     )
 
-    return {
-        "id": slugify(result.title),
-        "title": result.title,
-        "severity": result.severity.value,
-        "description": result.description,
-        "relatedProvisions": [provision['id']]
-    }
+    # Tolerate prose or code fences around the array
+    text = result.concerns_json
+    try:
+        entries = orjson.loads(text[text.index('['):text.rindex(']') + 1])
+    except ValueError:
+        return {}
+
+    concerns = {}
+    for entry in entries:
+        try:
+            i = int(entry['id'])
+            title = str(entry['title'])
+            description = str(entry['description'])
+            severity = Severity(entry['severity'])
+        except (KeyError, TypeError, ValueError):
+            continue
 
+        if 0 <= i < len(provisions) and title:
+            concerns[i] = make_concern(provisions[i], title, description, severity)
+
+    return concerns
+
+
+def generate_key_concerns(bill_context: str, provisions: list) -> dict:
+    """Generate concerns for a group of provisions, packing them into one call when possible.
+
+    Any provision the packed call fails to return is generated on its own.
+
+    Args:
+        bill_context: Executive summary for context
+        provisions: Provision dicts, as for generate_key_concern()
+
+    Returns:
+        Dict mapping position in provisions to concern
+    """
+    concerns = {}
+    if len(provisions) > 1:
+        try:
+            concerns = generate_key_concerns_packed(bill_context, provisions)
+        except Exception as e:
+            print(f"  ⚠ Packed generation failed, generating individually: {e}")
+
+    for i, provision in enumerate(provisions):
+        if i not in concerns:
+            concerns[i] = generate_key_concern(bill_context, provision['topic'], provision)
+
+    return concerns
+
+
+# Cached concerns only match the prompts they were made with (most come from
+# BatchKeyConcernGenerator); any change to either signature starts a fresh cache generation
+SIGNATURE_VERSION = signature_version(KeyConcernGenerator, BatchKeyConcernGenerator)
+
+
+def open_concern_cache(output_dir: Path, dry_run: bool = False) -> sqlite3.Connection:
+    """Open (creating if needed) the cross-bill concern cache.
+
+    Args:
+        output_dir: Directory holding the bill JSON files
+        dry_run: If True, read the cache without creating or writing it
+
+    Returns:
+        SQLite connection; only use it from the thread that opened it
+    """
+    return open_sqlite_cache(
+        output_dir / CONCERN_CACHE_NAME,
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(key TEXT PRIMARY KEY, signature_version TEXT, concern_json TEXT)",
+        read_only=dry_run,
+    )
+
+
+def concern_key(provision: dict) -> str:
+    """Hash the provision inputs of a concern for concern cache lookups.
+
+    The bill context is deliberately left out, so identical clauses with the
+    same impact assessment match across bills and versions.
+    """
+    text = "\n".join((
+        provision['topic'], provision['impact_level'], provision['title'],
+        provision['raw_text'], provision['impact_reasoning'],
+    ))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
-def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
+
+def generate_key_concerns_batch(json_path: Path, bill_context: str, provisions: list) -> dict:
+    """Generate key concerns through Anthropic's Message Batches API.
+
+    Args:
+        json_path: Path to bill JSON file (the in-flight batch id is saved next to it)
+        bill_context: Executive summary for context
+        provisions: Provision dicts, as for generate_key_concern()
+
+    Returns:
+        Dict mapping provision index to concern; failed items are left out
+    """
+    signature = KeyConcernGenerator
+
+    # The section index is stable across runs, so a batch resumed from its saved id
+    # still matches results to the right provisions if the pending list has changed
+    by_custom_id = {f"provision-{p['index']}": p for p in provisions}
+    requests = [
+        message_batches.build_request(
+            ADAPTER, signature, custom_id, concern_inputs(bill_context, provision['topic'], provision),
+            model=BATCH_MODEL, max_tokens=CONCERN_MAX_TOKENS, temperature=0,
+        )
+        for custom_id, provision in by_custom_id.items()
+    ]
+
+    texts = message_batches.run_batch(requests, json_path.with_suffix('.concerns.batch_id'))
+
+    concerns = {}
+    for custom_id, text in texts.items():
+        provision = by_custom_id.get(custom_id)
+        if provision is None:
+            continue
+
+        try:
+            fields = ADAPTER.parse(signature, text)
+        except Exception:
+            continue
+
+        concerns[provision['index']] = make_concern(
+            provision, fields['title'], fields['description'], fields['severity']
+        )
+
+    return concerns
+
+
+def process_bill(json_path: Path, dry_run: bool = False, force: bool = False, reuse_cache: bool = False,
+                 batch: bool = False):
     """Process a bill JSON file and generate key concerns.
 
     Args:
         json_path: Path to bill JSON file
         dry_run: If True, only show concerns without saving
-        force: If True, regenerate even if exists
+        force: If True, regenerate even if exists (with the LLM, not the cache)
+        reuse_cache: If True, reuse cached concerns even in force mode
+        batch: If True, use the Message Batches API (half price, slow turnaround)
     """
     print(f"\nProcessing: {json_path.name}")
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     # Check if already has key concerns
     if 'keyConcerns' in bill_data and not force:
@@ -180,33 +409,33 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
         if not impact:
             continue
 
-        impact_levels = impact.get('levels', {})
-        confidence = impact.get('confidence', 0.5)
-
-        # Find the first severe-negative or high-negative impact for this provision
-        severe_impact = None
-        high_impact = None
+        # Step 6 records each provision's worst negative impact (and refreshes it
+        # on every run, so rerun it after hand-editing levels); work it out here
+        # only for bills assessed before it did
+        if 'worstNegative' in impact:
+            worst = impact['worstNegative']
+        else:
+            worst = worst_negative(impact.get('levels', {}))
 
-        for topic in TOPICS:
-            impact_level = impact_levels.get(topic, 'none')
-            if impact_level == 'severe-negative' and not severe_impact:
-                severe_impact = {'topic': topic, 'level': impact_level}
-            elif impact_level == 'high-negative' and not high_impact:
-                high_impact = {'topic': topic, 'level': impact_level}
+        if not worst or worst['level'] not in ('severe-negative', 'high-negative'):
+            continue
 
-        provision_data = {
+        provision = {
+            'index': section.get('index'),
             'id': section.get('id', ''),
             'title': section.get('title', ''),
             'raw_text': section.get('rawText', ''),
             'summary': section.get('summary', ''),
             'impact_reasoning': impact.get('reasoning', ''),
-            'confidence': confidence
+            'confidence': impact.get('confidence', 0.5),
+            'impact_level': worst['level'],
+            'topic': worst['topic']
         }
 
-        if severe_impact:
-            severe_provisions.append({**provision_data, 'impact_level': severe_impact['level'], 'topic': severe_impact['topic']})
-        elif high_impact:
-            high_provisions.append({**provision_data, 'impact_level': high_impact['level'], 'topic': high_impact['topic']})
+        if worst['level'] == 'severe-negative':
+            severe_provisions.append(provision)
+        else:
+            high_provisions.append(provision)
 
     # Sort high provisions by confidence (descending) for consistent ordering
     high_provisions.sort(key=lambda x: x['confidence'], reverse=True)
@@ -218,8 +447,7 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
         print("No provisions with severe-negative or high-negative impact found")
         print("Clearing any existing key concerns")
         bill_data['keyConcerns'] = []
-        with open(json_path, 'w') as f:
-            json.dump(bill_data, f, indent=2)
+        save_json(json_path, bill_data)
         print("✓ Cleared key concerns")
         return
 
@@ -228,21 +456,110 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     print(f"Generating {len(impactful_provisions)} key concern(s) from ALL severe and high provisions")
     print()
 
-    # Generate one concern per provision
-    key_concerns = []
+    # Generate one concern per provision concurrently, keeping provision order
+    key_concerns = [None] * len(impactful_provisions)
 
-    for i, provision in enumerate(impactful_provisions, 1):
-        print(f"[{i}/{len(impactful_provisions)}] {provision['topic']}: {provision['title'][:50]}...")
+    # Restore concerns checkpointed by an interrupted run
+    sidecar_path = json_path.with_suffix('.concerns.jsonl')
+    checkpointed = read_checkpoint(sidecar_path, 'concern')
+    for i, provision in enumerate(impactful_provisions):
+        key_concerns[i] = checkpointed.get(provision['index'])
 
-        concern = generate_key_concern(executive_summary, provision['topic'], provision)
-        key_concerns.append(concern)
+    pending = [i for i, concern in enumerate(key_concerns) if concern is None]
+    if len(pending) < len(impactful_provisions):
+        print(f"Resuming: restored {len(impactful_provisions) - len(pending)} concern(s) from {sidecar_path.name}")
+        print()
 
+    generated_count = 0
+    cached_count = 0
+    total = len(pending)
+
+    # Checkpoint each concern to an append-only sidecar instead of rewriting the bill
+    sidecar = None if dry_run else open(sidecar_path, 'ab')
+    concern_cache = open_concern_cache(json_path.parent, dry_run=dry_run)
+
+    def record(i: int, concern: dict, store: bool = True):
+        """Apply one concern to its slot, checkpoint it, and show progress."""
+        nonlocal generated_count
+
+        provision = impactful_provisions[i]
+        key_concerns[i] = concern
+        generated_count += 1
+
+        write_checkpoint(sidecar, provision, 'concern', concern)
+
+        # Only the generated fields are cached; id and relatedProvisions are per bill
+        if store and not dry_run:
+            concern_cache.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (concern_key(provision), SIGNATURE_VERSION, orjson.dumps({
+                    "title": concern['title'],
+                    "description": concern['description'],
+                    "severity": concern['severity'],
+                }).decode('utf-8'))
+            )
+            # Commit each entry so parallel bills aren't locked out for this whole run
+            concern_cache.commit()
+
+        print(f"[{generated_count}/{total}] {provision['topic']}: {provision['title'][:50]}...")
         print(f"  ✓ {concern['severity'].upper()}: {concern['title']}")
         print()
 
+    try:
+        # Reuse concerns for identical provisions from earlier runs (unless force
+        # mode asks for fresh ones)
+        if reuse_cache or not force:
+            uncached = []
+            for i in pending:
+                row = concern_cache.execute(
+                    "SELECT concern_json FROM cache WHERE key = ? AND signature_version = ?",
+                    (concern_key(impactful_provisions[i]), SIGNATURE_VERSION)
+                ).fetchone()
+                if row:
+                    fields = orjson.loads(row[0])
+                    record(i, make_concern(
+                        impactful_provisions[i], fields['title'], fields['description'], Severity(fields['severity'])
+                    ), store=False)
+                    cached_count += 1
+                else:
+                    uncached.append(i)
+            pending = uncached
+
+        # Batch mode: submit everything as one Message Batch, then generate any
+        # failed items synchronously below
+        if batch and pending:
+            batch_concerns = generate_key_concerns_batch(
+                json_path, executive_summary, [impactful_provisions[i] for i in pending]
+            )
+            for i in pending:
+                if impactful_provisions[i]['index'] in batch_concerns:
+                    record(i, batch_concerns[impactful_provisions[i]['index']])
+
+            failed = [i for i in pending if impactful_provisions[i]['index'] not in batch_concerns]
+            print(f"Generated {len(pending) - len(failed)} concern(s) in batch")
+            if failed:
+                print(f"Generating {len(failed)} failed batch item(s) synchronously")
+            print()
+            pending = failed
+
+        # Generate CONCERNS_PER_CALL provisions per request, with groups running concurrently
+        chunks = [pending[i:i + CONCERNS_PER_CALL] for i in range(0, len(pending), CONCERNS_PER_CALL)]
+
+        tasks = [(chunk, (executive_summary, [impactful_provisions[i] for i in chunk])) for chunk in chunks]
+        for chunk, concerns in run_concurrently(generate_key_concerns, tasks, MAX_WORKERS):
+            for position, i in enumerate(chunk):
+                record(i, concerns[position])
+    finally:
+        if sidecar:
+            sidecar.close()
+        concern_cache.close()
+
+    if cached_count:
+        print(f"Reused {cached_count} concern(s) for unchanged provisions from {CONCERN_CACHE_NAME}")
+        print()
+
     # Sort by severity (critical > high > medium > low)
-    severity_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
-    key_concerns.sort(key=lambda x: severity_order.get(x['severity'], 99))
+    key_concerns.sort(key=severity_rank)
 
     # Show results
     print()
@@ -264,50 +581,210 @@ def process_bill(json_path: Path, dry_run: bool = False, force: bool = False):
     # Add to bill data
     bill_data['keyConcerns'] = key_concerns
 
-    # Save
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(bill_data, f, indent=2, ensure_ascii=False)
+    # Merge all concerns into the bill with a single write, then drop the checkpoint
+    save_json(json_path, bill_data)
+    sidecar_path.unlink(missing_ok=True)
 
     print(f"✓ Saved {len(key_concerns)} key concerns to: {json_path.name}")
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python 8_generate_key_concerns.py <bill-json-path> [--dry-run] [--force]")
+def needs_concerns(json_path: Path, force: bool = False) -> bool:
+    """Check whether process_bill() would generate concerns (and so need an LM) for a bill.
+
+    Unreadable bills count as needing work, so process_bill() reports the error.
+    """
+    if force:
+        return True
+
+    try:
+        return 'keyConcerns' not in load_json(json_path)
+    except (OSError, orjson.JSONDecodeError):
+        return True
+
+
+def _init_bill_worker(max_workers: int):
+    """Give a bill worker process its share of MAX_WORKERS."""
+    global MAX_WORKERS
+    MAX_WORKERS = max_workers
+
+
+def _process_bill_worker(json_path: Path, **kwargs):
+    """Run process_bill in a bill worker process, scoped to its own LM."""
+    with dspy.context(lm=setup_dspy(), adapter=ADAPTER):
+        process_bill(json_path, **kwargs)
+
+
+def process_bills(json_paths: list, dry_run: bool = False, force: bool = False, reuse_cache: bool = False,
+                  batch: bool = False) -> list:
+    """Process several bills in parallel, one worker process per bill.
+
+    Args:
+        json_paths: Paths to bill JSON files
+        dry_run: If True, only show concerns without saving
+        force: If True, regenerate even if exists
+        reuse_cache: If True, reuse cached concerns even in force mode
+        batch: If True, use the Message Batches API (half price, slow turnaround)
+
+    Returns:
+        Paths of bills that failed
+    """
+    processes = min(BILL_WORKERS, len(json_paths))
+    failed = []
+
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_bill_worker, initargs=(max(1, MAX_WORKERS // processes),)
+    ) as executor:
+        futures = {
+            executor.submit(
+                _process_bill_worker, json_path, dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch
+            ): json_path
+            for json_path in json_paths
+        }
+
+        for future in as_completed(futures):
+            json_path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                # Report and keep going: the other bills' work is still saved
+                print(f"Error processing {json_path.name}: {e}")
+                traceback.print_exception(e)
+                failed.append(json_path)
+
+    return failed
+
+
+def serve(dry_run: bool = False, force: bool = False, reuse_cache: bool = False, batch: bool = False) -> int:
+    """Process bill paths read from stdin, one per line, until end of input.
+
+    The LM (and its pooled HTTP connections) and the predictors are set up once and
+    reused for every bill, instead of once per script invocation.
+
+    Args:
+        dry_run: If True, only show concerns without saving
+        force: If True, regenerate even if exists
+        reuse_cache: If True, reuse cached concerns even in force mode
+        batch: If True, use the Message Batches API (half price, slow turnaround)
+
+    Returns:
+        Number of bills that failed
+    """
+    failed = 0
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        json_path = Path(line.strip())
+        if not json_path.exists():
+            print(f"Error: File not found: {json_path}")
+            failed += 1
+            continue
+
+        try:
+            process_bill(json_path, dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch)
+        except Exception as e:
+            # Report and keep serving: one bad bill shouldn't end the session
+            print(f"Error processing {json_path.name}: {e}")
+            traceback.print_exc()
+            failed += 1
+
+        # Flush so a driver reading our output sees each bill as it finishes
+        sys.stdout.flush()
+
+    return failed
+
+
+def main() -> int:
+    """Main entry point.
+
+    Returns:
+        Process exit code
+    """
+    server = "--server" in sys.argv
+
+    if not server and (len(sys.argv) < 2 or sys.argv[1].startswith("-")):
+        print("Usage: python 8_generate_key_concerns.py <bill-json-path>... [--dry-run] [--force] [--force-cached] [--batch]")
+        print("       python 8_generate_key_concerns.py --server [--dry-run] [--force] [--force-cached] [--batch]")
         print()
         print("Example:")
         print("  python 8_generate_key_concerns.py 'output/1. National Information Technology Authority (Amendment) Bill.json'")
+        print("  python 8_generate_key_concerns.py output/bill1.json output/bill2.json  # Several bills in parallel")
         print("  python 8_generate_key_concerns.py output/bill.json --dry-run  # Test without saving")
-        print("  python 8_generate_key_concerns.py output/bill.json --force    # Regenerate")
-        sys.exit(1)
+        print("  python 8_generate_key_concerns.py output/bill.json --force    # Regenerate with the LLM")
+        print("  python 8_generate_key_concerns.py output/bill.json --force-cached  # Regenerate (reuses cached provisions)")
+        print("  python 8_generate_key_concerns.py output/bill.json --batch    # Half-price Message Batches (slow)")
+        print("  find output -name '*.json' ! -name '*.docling.json' | python 8_generate_key_concerns.py --server")
+        return 1
 
     # Check for flags
     dry_run = "--dry-run" in sys.argv
-    force = "--force" in sys.argv or "-f" in sys.argv
-
-    # Get single bill path
-    bill_path = Path(sys.argv[1])
-
-    if not bill_path.exists():
-        print(f"Error: File not found: {bill_path}")
-        sys.exit(1)
+    reuse_cache = "--force-cached" in sys.argv
+    # --force-all is accepted for parity with step 6; step 8 has no procedural
+    # shortcut, so it is the same as --force
+    force = reuse_cache or "--force" in sys.argv or "--force-all" in sys.argv or "-f" in sys.argv
+    batch = "--batch" in sys.argv
+
+    # Server mode: set up once, then process bill paths from stdin
+    if server:
+        print("Initializing DSPy...")
+        lm = setup_dspy()
+        print("✓ DSPy initialized")
+        print()
 
-    # Setup DSPy
-    print("Initializing DSPy...")
-    setup_dspy()
-    print("✓ DSPy initialized")
-    print()
+        with dspy.context(lm=lm, adapter=ADAPTER):
+            return 1 if serve(dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch) else 0
+
+    # Get bill paths
+    bill_paths = [Path(arg) for arg in sys.argv[1:] if not arg.startswith("-")]
+
+    for bill_path in bill_paths:
+        if not bill_path.exists():
+            print(f"Error: File not found: {bill_path}")
+            return 1
+
+    # Bills that already have key concerns are skipped without any LLM calls, so
+    # only set up DSPy when at least one bill needs generating
+    pending = [bill_path for bill_path in bill_paths if needs_concerns(bill_path, force)]
+
+    if len(bill_paths) > 1:
+        # Only the bill workers make LLM calls and each builds its own LM, so the
+        # parent just checks the API key before starting them
+        if pending:
+            check_api_key()
+
+        # Finished bills only print a skip message, so don't start workers (and LMs) for them
+        for bill_path in bill_paths:
+            if bill_path not in pending:
+                process_bill(bill_path, dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch)
+
+        failed = []
+        if pending:
+            failed = process_bills(pending, dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch)
+        if failed:
+            print(f"\n{len(failed)} of {len(bill_paths)} bill(s) failed")
+            return 1
+        return 0
+
+    lm = None
+    if pending:
+        print("Initializing DSPy...")
+        lm = setup_dspy()
+        print("✓ DSPy initialized")
+        print()
 
     # Process the bill
+    bill_path = bill_paths[0]
     try:
-        process_bill(bill_path, dry_run=dry_run, force=force)
+        with dspy.context(lm=lm, adapter=ADAPTER):
+            process_bill(bill_path, dry_run=dry_run, force=force, reuse_cache=reuse_cache, batch=batch)
     except Exception as e:
         print(f"Error processing {bill_path.name}: {e}")
-        import traceback
         traceback.print_exc()
-        sys.exit(1)
+        return 1
+
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
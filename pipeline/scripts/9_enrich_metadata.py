@@ -6,17 +6,20 @@ This script adds metadata fields like bill title, PDF path, processing dates,
 and statistics to the bill JSON after all processing is complete.
 """
 
-import json
+import os
 import sys
 import re
 from pathlib import Path
 from datetime import datetime, timezone
-from shared import slugify
+from shared import load_json, save_json, slugify
+
+# Leading list number on bill file names, e.g. "1. " or "15. "
+_NUMBER_PREFIX_RE = re.compile(r'^\d+\.\s*')
 
 
 def remove_number_prefix(text: str) -> str:
     """Remove leading number prefix from bill title (e.g., '1. ' or '15. ')."""
-    return re.sub(r'^\d+\.\s*', '', text)
+    return _NUMBER_PREFIX_RE.sub('', text)
 
 
 def extract_bill_title(sections: list) -> str:
@@ -46,46 +49,57 @@ def calculate_statistics(sections: list) -> dict:
     Returns:
         Dict with statistics
     """
-    stats = {
-        'totalSections': len(sections),
-        'provisions': 0,
-        'preambles': 0,
-        'metadata': 0,
-        'withSummaries': 0,
-        'withImpacts': 0
-    }
+    # Count with plain locals and build the dict once at the end
+    provisions = preambles = metadata = with_summaries = with_impacts = 0
 
     for section in sections:
         category_type = section.get('category', {}).get('type', '')
 
         if category_type == 'provision':
-            stats['provisions'] += 1
+            provisions += 1
         elif category_type == 'preamble':
-            stats['preambles'] += 1
+            preambles += 1
         elif category_type == 'metadata':
-            stats['metadata'] += 1
+            metadata += 1
 
         if section.get('summary'):
-            stats['withSummaries'] += 1
+            with_summaries += 1
+
+        # Step 6 stores assessments under 'impact'
+        if section.get('impact'):
+            with_impacts += 1
+
+    return {
+        'totalSections': len(sections),
+        'provisions': provisions,
+        'preambles': preambles,
+        'metadata': metadata,
+        'withSummaries': with_summaries,
+        'withImpacts': with_impacts
+    }
 
-        if section.get('impacts'):
-            stats['withImpacts'] += 1
 
-    return stats
+def list_pdfs(pdf_dir: Path) -> set:
+    """List the file names in a pdfs/ directory (empty if it doesn't exist)."""
+    try:
+        return set(os.listdir(pdf_dir))
+    except FileNotFoundError:
+        return set()
 
 
-def enrich_metadata(json_path: Path):
+def enrich_metadata(json_path: Path, pdf_index: set | None = None):
     """Enrich bill JSON with metadata.
 
     Args:
         json_path: Path to bill JSON file
+        pdf_index: File names in the pdfs/ directory from list_pdfs(), so a run over
+            many bills lists it once; if None, the bill's PDF is checked directly
     """
     print(f"\nProcessing: {json_path.name}")
     print("=" * 80)
 
     # Load bill JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        bill_data = json.load(f)
+    bill_data = load_json(json_path)
 
     sections = bill_data.get('sections', [])
 
@@ -102,23 +116,25 @@ def enrich_metadata(json_path: Path):
 
     # Find corresponding PDF path
     pdf_name = json_path.stem + '.pdf'
-    pdf_path = json_path.parent.parent / 'pdfs' / pdf_name
+    if pdf_index is None:
+        has_pdf = (json_path.parent.parent / 'pdfs' / pdf_name).exists()
+    else:
+        has_pdf = pdf_name in pdf_index
 
     # Load static metadata from bill-metadata.json
     static_metadata_path = json_path.parent.parent / 'bill-metadata.json'
     static_metadata = {}
     if static_metadata_path.exists():
-        with open(static_metadata_path, 'r', encoding='utf-8') as f:
-            all_static_metadata = json.load(f)
-            static_metadata = all_static_metadata.get(bill_slug, {})
-            if static_metadata:
-                print(f"✓ Found static metadata for {bill_slug}")
+        all_static_metadata = load_json(static_metadata_path)
+        static_metadata = all_static_metadata.get(bill_slug, {})
+        if static_metadata:
+            print(f"✓ Found static metadata for {bill_slug}")
 
     # Build metadata
     metadata = {
         'title': bill_title,
         'slug': bill_slug,
-        'pdfPath': f'pdfs/{pdf_name}' if pdf_path.exists() else None,
+        'pdfPath': f'pdfs/{pdf_name}' if has_pdf else None,
         'processedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
         'statistics': stats,
         'notebookLMUrl': static_metadata.get('notebookLMUrl', ''),
@@ -147,8 +163,7 @@ def enrich_metadata(json_path: Path):
     bill_data['metadata'] = metadata
 
     # Save
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(bill_data, f, indent=2, ensure_ascii=False)
+    save_json(json_path, bill_data)
 
     print(f"✓ Saved metadata to: {json_path.name}")
 
@@ -156,26 +171,40 @@ def enrich_metadata(json_path: Path):
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python 9_enrich_metadata.py <bill-json-path>")
+        print("Usage: python 9_enrich_metadata.py <bill-json-path>...")
         print()
         print("Example:")
         print("  python 9_enrich_metadata.py 'output/1. National Information Technology Authority (Amendment) Bill.json'")
+        print("  python 9_enrich_metadata.py output/bill1.json output/bill2.json  # Several bills")
         sys.exit(1)
 
-    # Get single bill path
-    bill_path = Path(sys.argv[1])
-
-    if not bill_path.exists():
-        print(f"Error: File not found: {bill_path}")
-        sys.exit(1)
-
-    # Process the bill
-    try:
-        enrich_metadata(bill_path)
-    except Exception as e:
-        print(f"Error processing {bill_path.name}: {e}")
-        import traceback
-        traceback.print_exc()
+    # Get bill paths
+    bill_paths = [Path(arg) for arg in sys.argv[1:]]
+
+    for bill_path in bill_paths:
+        if not bill_path.exists():
+            print(f"Error: File not found: {bill_path}")
+            sys.exit(1)
+
+    # List each pdfs/ directory once rather than checking every bill's PDF
+    pdf_indexes = {}
+    failed = 0
+
+    # Process the bills
+    for bill_path in bill_paths:
+        pdf_dir = bill_path.parent.parent / 'pdfs'
+        if pdf_dir not in pdf_indexes:
+            pdf_indexes[pdf_dir] = list_pdfs(pdf_dir)
+
+        try:
+            enrich_metadata(bill_path, pdf_index=pdf_indexes[pdf_dir])
+        except Exception as e:
+            print(f"Error processing {bill_path.name}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    if failed:
         sys.exit(1)
 
 
@@ -0,0 +1,44 @@
+"""
+Shared DSPy language models for the Claude-based pipeline steps.
+
+Each LM is built once per process and reused, so every bill and worker thread
+shares its pooled HTTP client, retry policy and response cache.
+
+The LMs are not configured globally; each step's setup_dspy() returns one and
+callers scope it with dspy.context(lm=lm, ...), so several bills can be
+processed in one interpreter without sharing settings.
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import dspy
+
+from shared import LLM_MAX_RETRIES
+
+
+def check_api_key():
+    """Exit with setup instructions if ANTHROPIC_API_KEY is not set."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        print("Error: ANTHROPIC_API_KEY not found in environment variables")
+        print("Please create a .env file with your Anthropic API key")
+        print("See .env.example for template")
+        sys.exit(1)
+
+
+@lru_cache(maxsize=None)
+def get_lm(model: str, temperature: float | None = None) -> dspy.LM:
+    """Build an LM once per (model, temperature) so its client and connections are reused.
+
+    Args:
+        model: LiteLLM model name
+        temperature: Sampling temperature, or None for the provider default
+
+    Returns:
+        DSPy LM instance
+    """
+    kwargs = {} if temperature is None else {"temperature": temperature}
+    # LiteLLM already reuses one pooled keep-alive HTTP client per process, so no client is
+    # passed here; a custom one would end up in DSPy's cache key and disable the disk cache
+    return dspy.LM(model=model, api_key=os.getenv("ANTHROPIC_API_KEY"), num_retries=LLM_MAX_RETRIES, **kwargs)
@@ -0,0 +1,101 @@
+"""
+Run DSPy signatures through Anthropic's Message Batches API.
+
+Batched requests cost half as much as synchronous calls but may take up to
+24 hours, so they suit offline runs over whole bills. Prompts are rendered by
+the same DSPy adapter as synchronous calls, so responses can be parsed with
+adapter.parse() and keep any prompt-cache breakpoints.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from shared import LLM_MAX_RETRIES
+
+# Seconds between status checks while a batch is processing
+POLL_SECONDS = 60
+
+
+def _text_blocks(content) -> list:
+    """Convert message content to a list of Anthropic content blocks."""
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return content
+
+
+def build_request(adapter, signature, custom_id: str, inputs: dict, model: str, max_tokens: int,
+                  **params) -> dict:
+    """Render one signature call as a Message Batches request.
+
+    Args:
+        adapter: DSPy adapter used for synchronous calls
+        signature: DSPy signature to format
+        custom_id: Identifier echoed back with the result
+        inputs: Signature input values
+        model: Anthropic model name
+        max_tokens: Response token cap
+        **params: Extra Messages API parameters (e.g. temperature)
+
+    Returns:
+        Request dict for client.messages.batches.create()
+    """
+    messages = adapter.format(signature, demos=[], inputs=inputs)
+
+    return {
+        "custom_id": custom_id,
+        "params": {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": [block for m in messages if m["role"] == "system" for block in _text_blocks(m["content"])],
+            "messages": [m for m in messages if m["role"] != "system"],
+            **params,
+        },
+    }
+
+
+def run_batch(requests: list, batch_id_path: Path) -> dict:
+    """Submit requests as one Message Batch and wait for it to finish.
+
+    The batch id is saved to batch_id_path until results are collected, so an
+    interrupted run picks up the same batch instead of submitting (and paying
+    for) a new one.
+
+    Args:
+        requests: Requests from build_request()
+        batch_id_path: File recording the in-flight batch id
+
+    Returns:
+        Dict mapping custom_id to response text for requests that succeeded
+    """
+    # Only needed in batch mode
+    import anthropic
+
+    client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=LLM_MAX_RETRIES)
+
+    if batch_id_path.exists():
+        message_batch = client.messages.batches.retrieve(batch_id_path.read_text().strip())
+        print(f"Resuming message batch {message_batch.id}")
+    else:
+        message_batch = client.messages.batches.create(requests=requests)
+        batch_id_path.write_text(message_batch.id)
+        print(f"Submitted message batch {message_batch.id} ({len(requests)} requests)")
+
+    # Poll until every request has finished
+    while message_batch.processing_status != "ended":
+        counts = message_batch.request_counts
+        print(f"  ⏳ {counts.processing} processing, {counts.succeeded} succeeded, {counts.errored} errored")
+        time.sleep(POLL_SECONDS)
+        message_batch = client.messages.batches.retrieve(message_batch.id)
+
+    texts = {}
+    for item in client.messages.batches.results(message_batch.id):
+        if item.result.type == "succeeded":
+            texts[item.custom_id] = "".join(
+                block.text for block in item.result.message.content if block.type == "text"
+            )
+
+    print(f"  ✓ Batch ended: {len(texts)}/{len(requests)} requests succeeded")
+    batch_id_path.unlink(missing_ok=True)
+
+    return texts
@@ -0,0 +1,57 @@
+"""
+DSPy adapter that marks stable prompt prefixes for Anthropic prompt caching.
+
+Anthropic caches everything up to a `cache_control` breakpoint, so repeated
+calls that share the same signature instructions (and, optionally, the same
+leading inputs such as a bill's executive summary) only pay full input-token
+cost on the first call.
+"""
+
+import dspy
+
+# Anthropic's only cache type; entries live for ~5 minutes after last use
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _cached_block(text: str) -> dict:
+    """Wrap text in a content block that ends a cacheable prefix."""
+    return {"type": "text", "text": text, "cache_control": CACHE_CONTROL}
+
+
+class CachedPrefixAdapter(dspy.ChatAdapter):
+    """ChatAdapter that adds Anthropic cache breakpoints to each prompt.
+
+    The system message (signature instructions) is always cached. The user
+    message is split just before the first input field named in `split_before`
+    that it contains, so every input ahead of it joins the cached prefix as
+    well. Inputs that should be cached must therefore be declared first in the
+    signature.
+    """
+
+    def __init__(self, split_before: tuple = (), **kwargs):
+        super().__init__(**kwargs)
+        self.split_before = split_before
+
+    def format(self, signature, demos, inputs):
+        messages = super().format(signature, demos, inputs)
+
+        for message in messages:
+            if message["role"] == "system" and isinstance(message["content"], str):
+                message["content"] = [_cached_block(message["content"])]
+
+        # The last message holds the current inputs in "[[ ## field ## ]]" sections
+        request = messages[-1]
+        if not isinstance(request["content"], str):
+            return messages
+
+        for field in self.split_before:
+            head, sep, tail = request["content"].partition(f"[[ ## {field} ## ]]")
+            if sep:
+                if head.strip():
+                    request["content"] = [
+                        _cached_block(head),
+                        {"type": "text", "text": sep + tail},
+                    ]
+                break
+
+        return messages
@@ -1,14 +1,236 @@
 """
-Shared constants for the bill processing pipeline.
+Shared constants and helpers for the bill processing pipeline.
 """
 
+import contextvars
+import hashlib
+import os
 import re
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
+from functools import lru_cache
+from pathlib import Path
 
+import orjson
 
+# Matches json.dump(..., indent=2, ensure_ascii=False) output byte-for-byte
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def load_json(path: Path):
+    """Load a JSON file.
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    return orjson.loads(Path(path).read_bytes())
+
+
+def save_json(path: Path, data, indent: bool = True) -> None:
+    """Save data as UTF-8 JSON.
+
+    Args:
+        path: Path to JSON file
+        data: JSON-serializable data
+        indent: If False, write compact JSON (cheaper for intermediate checkpoints;
+            the final save of a step should stay indented)
+    """
+    path = Path(path)
+    option = JSON_OPTIONS if indent else orjson.OPT_NON_STR_KEYS
+    content = orjson.dumps(data, option=option)
+
+    # Write to a temp file beside the target and swap it in, so readers (and an
+    # interrupted run) only ever see a complete file. The temp file is created
+    # like any new file (0o666 less the umask) and takes over the permissions of
+    # the file it replaces
+    tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex[:8]}.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_jsonl(path: Path) -> list:
+    """Read records from a JSON Lines checkpoint file.
+
+    A truncated final line (e.g. from an interrupted write) is ignored.
+
+    Args:
+        path: Path to JSONL file
+
+    Returns:
+        List of records (empty if the file does not exist)
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    records = []
+    for line in path.read_bytes().splitlines():
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue
+    return records
+
+
+def append_jsonl(f, record: dict) -> None:
+    """Append a record to an open JSON Lines file and flush it to disk.
+
+    Args:
+        f: File opened in binary append mode
+        record: JSON-serializable record
+    """
+    f.write(orjson.dumps(record) + b'\n')
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def read_checkpoint(path: Path, field: str) -> dict:
+    """Read results checkpointed to a JSONL sidecar by an interrupted run.
+
+    Args:
+        path: Path to the sidecar
+        field: Key each record's result is stored under
+
+    Returns:
+        Dict mapping item (section or provision) index to its checkpointed result
+    """
+    return {record['index']: record[field] for record in read_jsonl(path)}
+
+
+def restore_checkpoint(path: Path, items: list, field: str) -> set:
+    """Apply results checkpointed by an interrupted run to their items.
+
+    Args:
+        path: Path to the sidecar
+        items: Sections or provisions of the bill; each restored result is set as item[field]
+        field: Key each record's result is stored under
+
+    Returns:
+        Indexes of the items that were restored
+    """
+    checkpointed = read_checkpoint(path, field)
+    resumed = set()
+    for item in items:
+        index = item.get('index')
+        if index in checkpointed:
+            item[field] = checkpointed[index]
+            resumed.add(index)
+    return resumed
+
+
+def write_checkpoint(f, item: dict, field: str, result) -> None:
+    """Checkpoint one item's result to an open JSONL sidecar.
+
+    Args:
+        f: Sidecar opened in binary append mode, or None (dry runs) to skip
+        item: Section or provision the result belongs to
+        field: Key to store the result under, as passed to read_checkpoint()
+        result: JSON-serializable result
+    """
+    if f:
+        append_jsonl(f, {"index": item.get('index'), "id": item.get('id'), field: result})
+
+
+def run_concurrently(fn, tasks, max_workers: int):
+    """Call fn for each task in a thread pool, yielding results as they finish.
+
+    Results are yielded on the calling thread, so callers can apply them and
+    write checkpoints without racing. Each call runs in a copy of the caller's
+    context, since worker threads don't inherit dspy.context() settings. If a
+    call fails or the caller stops early, queued tasks are cancelled so no
+    further API calls are spent.
+
+    Args:
+        fn: Function to call
+        tasks: Iterable of (key, args) pairs; fn is called as fn(*args)
+        max_workers: Maximum number of concurrent calls
+
+    Yields:
+        (key, result) pairs in completion order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(contextvars.copy_context().run, fn, *args): key for key, args in tasks}
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def signature_version(*signatures) -> str:
+    """Fingerprint DSPy signatures, for versioning cached LLM results.
+
+    Covers the instructions and every field's name, type and description, so any
+    edit to what the model is asked for starts a fresh cache generation.
+
+    Args:
+        *signatures: DSPy signature classes whose prompts produce the cached results
+
+    Returns:
+        Short hex digest
+    """
+    digest = hashlib.sha256()
+    for signature in signatures:
+        digest.update(signature.instructions.encode('utf-8'))
+        for name, field in signature.fields.items():
+            desc = (field.json_schema_extra or {}).get('desc', '')
+            digest.update(f"\n{name}: {field.annotation} = {desc}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def open_sqlite_cache(path: Path, schema: str, read_only: bool = False) -> sqlite3.Connection:
+    """Open a cross-bill SQLite cache, creating it if needed.
+
+    Args:
+        path: Cache file
+        schema: CREATE TABLE IF NOT EXISTS statement for the cache table
+        read_only: If True (dry runs), never create or write the file; a missing
+            cache is replaced by an empty in-memory one
+
+    Returns:
+        SQLite connection; only use it from the thread that opened it
+    """
+    path = Path(path)
+    if read_only:
+        if path.exists():
+            return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        conn = sqlite3.connect(":memory:")
+    else:
+        # WAL lets parallel bill processes read while one of them writes
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    conn.execute(schema)
+    return conn
+
+
+# Slug cleanup patterns, compiled once
+_NON_SLUG_CHARS_RE = re.compile(r'[^a-z0-9\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_DASHES_RE = re.compile(r'-+')
+
+
+@lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
     """Convert text to a URL-friendly slug.
 
+    Memoized: it is pure and called repeatedly with the same titles and topics.
+
     Args:
         text: Text to slugify
 
@@ -16,9 +238,9 @@ def slugify(text: str) -> str:
         URL-friendly slug (lowercase, hyphens, alphanumeric only)
     """
     text = text.lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'\s+', '-', text)
-    text = re.sub(r'-+', '-', text)
+    text = _NON_SLUG_CHARS_RE.sub('', text)
+    text = _WHITESPACE_RE.sub('-', text)
+    text = _REPEATED_DASHES_RE.sub('-', text)
     return text.strip('-')
 
 
@@ -30,8 +252,8 @@ class Topic(str, Enum):
     BUSINESS_ENVIRONMENT = "Business Environment"
 
 
-# Topic areas list (for iteration)
-TOPICS = [topic.value for topic in Topic]
+# Topic areas (for iteration); a tuple since it is never modified
+TOPICS = tuple(topic.value for topic in Topic)
 
 
 class ImpactLevel(str, Enum):
@@ -47,6 +269,33 @@ class ImpactLevel(str, Enum):
     SEVERE_POSITIVE = "severe-positive"
 
 
+# Negative impact levels, worst first
+NEGATIVE_LEVELS = (
+    ImpactLevel.SEVERE_NEGATIVE.value,
+    ImpactLevel.HIGH_NEGATIVE.value,
+    ImpactLevel.MEDIUM_NEGATIVE.value,
+    ImpactLevel.LOW_NEGATIVE.value,
+)
+
+
+def worst_negative(levels: dict) -> dict | None:
+    """Find a provision's most severe negative impact across topics.
+
+    Ties go to the topic that comes first in TOPICS.
+
+    Args:
+        levels: Impact level per topic name, as in impact['levels']
+
+    Returns:
+        Dict with 'topic' and 'level' keys, or None if no topic is negatively affected
+    """
+    for level in NEGATIVE_LEVELS:
+        for topic in TOPICS:
+            if levels.get(topic) == level:
+                return {"topic": topic, "level": level}
+    return None
+
+
 class Severity(str, Enum):
     """Severity levels for key concerns."""
     CRITICAL = "critical"
@@ -55,6 +304,10 @@ class Severity(str, Enum):
     LOW = "low"
 
 
+# Attempts LiteLLM makes after a rate-limit (429), overload, or transient server
+# error; it backs off exponentially and honors Retry-After between attempts
+LLM_MAX_RETRIES = 6
+
 # Section categories
 CATEGORY_PROVISION = "provision"
 CATEGORY_PREAMBLE = "preamble"